@@ -0,0 +1,45 @@
+import json
+import os
+
+import pytest
+
+from utils.data_loader import _decode_header, get_match_info
+
+DATA_FOLDER = os.path.join(os.path.dirname(__file__), os.pardir, "data")
+MATCH_FILE = os.path.join(DATA_FOLDER, "1082591.json")
+
+
+def _header_text():
+    with open(MATCH_FILE, "r") as f:
+        text = f.read()
+    data = json.loads(text)
+    end = text.index('"innings"') + len('"innings"') + 2
+    return text[:end], {k: v for k, v in data.items() if k != "innings"}
+
+
+def test_header_cut_at_any_offset_is_truncated_or_complete():
+    text, expected = _header_text()
+    for end in range(len(text) + 1):
+        header = _decode_header(text[:end])
+        assert header is None or header == expected, end
+    assert _decode_header(text) == expected
+
+
+@pytest.mark.parametrize("text", ['{"meta" ', '{"meta"', '{"a": 1, "b"\n', '{"a": 12'])
+def test_buffer_ending_inside_a_member_is_truncated(text):
+    assert _decode_header(text) is None
+
+
+@pytest.mark.parametrize("text", ['[1, 2]', '{"a" 1}', '{"a": 1 "b": 2}'])
+def test_malformed_header_raises(text):
+    with pytest.raises(ValueError):
+        _decode_header(text)
+
+
+def test_match_info_matches_full_parse():
+    with open(MATCH_FILE, "r") as f:
+        info = json.load(f)["info"]
+    match_info = get_match_info(MATCH_FILE)
+    assert match_info["teams"] == info["teams"]
+    assert match_info["date"] == info["dates"][0]
+    assert match_info["venue"] == info["venue"]
@@ -0,0 +1,23 @@
+from utils.player_search import PlayerSearchIndex
+
+PEOPLE = [
+    ("J Theron", "dec8e038"),
+    ("AC Gilchrist", "2b6e6dec"),
+    ("Jalaj S Saxena", "249abedf"),
+    ("BJ Haddin", "1a2b3c4d"),
+    ("N Saini", "21d4e29b"),
+    ("Navdeep Saini", "21d4e29b"),
+]
+
+
+def test_name_query_never_matches_inside_a_registry_id():
+    index = PlayerSearchIndex(PEOPLE)
+    assert index.search("dec") == []
+    assert index.search("abe") == []
+    assert index.search("add") == ["BJ Haddin"]
+
+
+def test_whole_registry_id_finds_every_spelling():
+    index = PlayerSearchIndex(PEOPLE)
+    assert index.search("21D4E29B") == ["N Saini", "Navdeep Saini"]
+    assert index.search("saini") == ["N Saini", "Navdeep Saini"]
@@ -0,0 +1,222 @@
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.delivery_store import build_delivery_store
+from utils.stats_processor import (
+    compute_batting_stats,
+    compute_bowling_stats,
+    compute_match_level_true_batting_stats,
+    compute_phase_stats,
+    compute_true_batting_stats_from_store,
+)
+
+DATA_FOLDER = os.path.join(os.path.dirname(__file__), os.pardir, "data")
+FIXTURE_MATCHES = ["1082591", "1082592", "1082593"]
+
+
+def _build_store(folder):
+    store, errors = build_delivery_store(str(folder), store_path=str(folder / "store.npz"), workers=1)
+    assert errors == []
+    return store
+
+
+@pytest.fixture(scope="module")
+def fixture_store(tmp_path_factory):
+    folder = tmp_path_factory.mktemp("fixture")
+    for match_id in FIXTURE_MATCHES:
+        shutil.copy(os.path.join(DATA_FOLDER, f"{match_id}.json"), folder)
+    return _build_store(folder)
+
+
+@pytest.fixture(scope="module")
+def unnamed_store(tmp_path_factory):
+    """
+    Fixture matches where one delivery has no bowler and one squad slot has no player.
+    The player with the highest registry id (the last player id) bats and bowls once in another match,
+    so an unnamed id of -1 wrapping onto the last player shows up in their counts.
+    """
+    folder = tmp_path_factory.mktemp("unnamed")
+    for match_id in FIXTURE_MATCHES:
+        with open(os.path.join(DATA_FOLDER, f"{match_id}.json"), "r") as f:
+            data = json.load(f)
+        if match_id == FIXTURE_MATCHES[0]:
+            data["innings"][0]["overs"][0]["deliveries"][0]["bowler"] = ""
+            team = next(iter(data["info"]["players"]))
+            data["info"]["players"][team].append("")
+        elif match_id == FIXTURE_MATCHES[1]:
+            data["innings"][0]["overs"][0]["deliveries"][0]["bowler"] = "ZZ Last"
+            data["innings"][1]["overs"][0]["deliveries"][0]["batter"] = "ZZ Last"
+            team = data["innings"][1]["team"]
+            data["info"]["players"][team].append("ZZ Last")
+            data["info"]["registry"]["people"]["ZZ Last"] = "ffffffff"
+        with open(folder / f"{match_id}.json", "w") as f:
+            json.dump(data, f)
+    return _build_store(folder)
+
+
+def test_unnamed_bowler_is_not_counted_for_any_player(unnamed_store):
+    deliveries = unnamed_store["deliveries"]
+    named = deliveries[deliveries["bowler"] != ""]
+    expected = named.groupby("bowler", observed=True)["match_id"].nunique()
+    stats = compute_bowling_stats(unnamed_store)
+    assert "" not in stats.index
+    assert stats["Matches"].to_dict() == expected.to_dict()
+
+
+def test_unnamed_squad_player_is_not_counted_for_any_player(unnamed_store):
+    squads = unnamed_store["squads"]
+    expected = squads[squads["player"] != ""].groupby("player", observed=True)["match_id"].nunique()
+    stats = compute_batting_stats(unnamed_store)
+    assert (stats["Matches"] == expected.reindex(stats.index)).all()
+
+
+# Batting Stats table of the original inline Batting Stats loop over FIXTURE_MATCHES
+BASELINE_BATTING = {
+    "SPD Smith": {"Matches": 1, "Innings": 1, "Not Outs": 1, "Dismissals": 0, "Runs": 84, "Balls": 54,
+                  "SR": 155.56, "4s": 7, "6s": 3, "BpB": 5.4, "Dots": 14, "Dot_%": 25.93,
+                  "30s": 1, "50s": 1, "100s": 0},
+    "Yuvraj Singh": {"Matches": 1, "Innings": 1, "Not Outs": 0, "Dismissals": 1, "Runs": 62, "Balls": 27,
+                     "SR": 229.63, "Average": 62, "4s": 7, "6s": 3, "BpB": 2.7, "Dots": 4, "Dot_%": 14.81,
+                     "30s": 1, "50s": 1, "100s": 0},
+    "KD Karthik": {"Matches": 1, "Innings": 1, "Not Outs": 0, "Dismissals": 1, "Runs": 47, "Balls": 24,
+                   "SR": 195.83, "Average": 47, "4s": 6, "6s": 2, "BpB": 3.0, "Dots": 5, "Dot_%": 20.83,
+                   "30s": 1, "50s": 0, "100s": 0},
+    "MC Henriques": {"Matches": 1, "Innings": 1, "Not Outs": 0, "Dismissals": 1, "Runs": 52, "Balls": 37,
+                     "SR": 140.54, "Average": 52, "4s": 3, "6s": 2, "BpB": 7.4, "Dots": 9, "Dot_%": 24.32,
+                     "30s": 1, "50s": 1, "100s": 0},
+    "KA Pollard": {"Matches": 1, "Innings": 1, "Not Outs": 0, "Dismissals": 1, "Runs": 27, "Balls": 17,
+                   "SR": 158.82, "Average": 27, "4s": 3, "6s": 1, "BpB": 4.25, "Dots": 4, "Dot_%": 23.53,
+                   "30s": 0, "50s": 0, "100s": 0},
+}
+
+
+def _assert_pinned(stats, expected):
+    for player, values in expected.items():
+        for column, value in values.items():
+            assert stats.loc[player, column] == pytest.approx(value, abs=0.005), (player, column)
+
+
+def test_batting_stats_match_baseline(fixture_store):
+    stats = compute_batting_stats(fixture_store)
+    assert len(stats) == 38
+    assert list(stats.index) == sorted(stats.index)
+    _assert_pinned(stats, BASELINE_BATTING)
+    # Not out in every innings: the average is undefined
+    assert np.isnan(stats.loc["SPD Smith", "Average"])
+
+
+def test_match_selection_sums_only_the_selected_matches(fixture_store):
+    # The original loop run over match 1082592 alone lists 14 batters, including Smith and Pollard
+    selected = compute_batting_stats(fixture_store, [FIXTURE_MATCHES[1]])
+    assert len(selected) == 14
+    _assert_pinned(selected, {player: BASELINE_BATTING[player] for player in ["SPD Smith", "KA Pollard"]})
+    assert "Yuvraj Singh" not in selected.index
+
+    # Counters are additive: the other two matches hold every remaining batter
+    rest = compute_batting_stats(fixture_store, [FIXTURE_MATCHES[0], FIXTURE_MATCHES[2]])
+    full = compute_batting_stats(fixture_store)
+    counters = ["Matches", "Innings", "Dismissals", "Runs", "Balls", "4s", "6s", "Dots", "30s", "50s"]
+    combined = selected[counters].add(rest[counters], fill_value=0)
+    assert (combined.reindex(full.index) == full[counters]).all().all()
+
+
+# Death-over (DO_*) columns of the original Batting Stats loop over FIXTURE_MATCHES
+BASELINE_DEATH_OVERS = {
+    "SPD Smith": {"DO_Runs": 32, "DO_SR": 213.33, "DO_4s": 2, "DO_6s": 2, "DO_Dots": 2, "DO_Dismissals": 0},
+    "Yuvraj Singh": {"DO_Runs": 22, "DO_SR": 220.0, "DO_4s": 3, "DO_6s": 1, "DO_Dots": 2, "DO_Dismissals": 1},
+    "KD Karthik": {"DO_Runs": 33, "DO_SR": 253.85, "DO_4s": 4, "DO_6s": 2, "DO_Dots": 2, "DO_Dismissals": 1},
+    "MC Henriques": {"DO_Runs": 0, "DO_SR": 0.0, "DO_4s": 0, "DO_6s": 0, "DO_Dots": 2, "DO_Dismissals": 1},
+    "KA Pollard": {"DO_Runs": 19, "DO_SR": 172.73, "DO_4s": 2, "DO_6s": 1, "DO_Dots": 3, "DO_Dismissals": 1},
+}
+
+
+def test_death_over_phase_matches_baseline(fixture_store):
+    _assert_pinned(compute_phase_stats(fixture_store), BASELINE_DEATH_OVERS)
+    batting = compute_batting_stats(fixture_store)
+    _assert_pinned(batting, BASELINE_DEATH_OVERS)
+    _assert_pinned(batting, {"SPD Smith": {"DO_%": 38.1}, "KD Karthik": {"DO_%": 70.21},
+                             "MC Henriques": {"DO_%": 0.0}})
+
+
+def test_phases_partition_the_innings(fixture_store):
+    batting = compute_batting_stats(fixture_store)
+    phases = compute_phase_stats(fixture_store).reindex(batting.index, fill_value=0)
+    for stat in ["Runs", "Balls", "4s", "6s", "Dots", "Dismissals"]:
+        total = phases[f"PP_{stat}"] + phases[f"MID_{stat}"] + phases[f"DO_{stat}"]
+        assert (total == batting[stat]).all(), stat
+
+    # A custom phase set is answered from the same rows
+    custom = compute_phase_stats(fixture_store, phases=[("FIRST", 0, 9), ("LAST", 10, 19)])
+    assert list(custom.columns[:2]) == ["FIRST_Runs", "FIRST_Balls"]
+    assert (custom["FIRST_Runs"] + custom["LAST_Runs"]).reindex(batting.index, fill_value=0).equals(batting["Runs"])
+
+
+# compute_match_level_true_batting_stats of the original stats_processor on FIXTURE_MATCHES:
+# (runs, balls, outs, true average, true strike rate)
+BASELINE_TRUE_BATTING = {
+    "Yuvraj Singh": (62, 30, 1, 24.0, 29.166666666666675),
+    "SPD Smith": (84, 55, 0, 37.704918032786885, 1.81818181818183),
+    "SK Raina": (68, 52, 0, 51.955307262569825, -10.87236785560808),
+    "KD Karthik": (47, 25, 1, 5.027932960893855, 28.134078212290504),
+    "CA Lynn": (93, 46, 0, 0.0, 14.844352971443264),
+}
+
+
+def _match_data(match_id):
+    with open(os.path.join(DATA_FOLDER, f"{match_id}.json"), "r") as f:
+        return json.load(f)
+
+
+def test_true_batting_matches_baseline(fixture_store):
+    per_match = pd.concat([compute_match_level_true_batting_stats(_match_data(m)) for m in FIXTURE_MATCHES])
+    per_match = per_match.set_index("player")
+    career = compute_true_batting_stats_from_store(fixture_store, top_n=50).set_index("batter")
+    for player, (runs, balls, outs, true_avg, true_sr) in BASELINE_TRUE_BATTING.items():
+        row = per_match.loc[player]
+        assert (row["runs"], row["balls"], row["outs"]) == (runs, balls, outs)
+        assert row["true_average"] == pytest.approx(true_avg)
+        assert row["true_strike_rate"] == pytest.approx(true_sr)
+        # Each batter played one fixture match, so the career mean is that match's value
+        row = career.loc[player]
+        assert (row["runs"], row["balls"], row["outs"], row["matches_played"]) == (runs, balls, outs, 1)
+        assert row["true_avg"] == pytest.approx(true_avg)
+        assert row["true_sr"] == pytest.approx(true_sr)
+
+
+# Per-position columns of the original Batting Stats loop over FIXTURE_MATCHES
+BASELINE_POSITIONS = {
+    "SPD Smith": {"1_Runs": 84, "1_Balls": 54, "1_SR": 155.56, "1_4s": 7, "1_6s": 3, "1_30s": 1, "1_50s": 1},
+    "Yuvraj Singh": {"2_Runs": 62, "2_Balls": 27, "2_SR": 229.63, "2_Average": 62, "2_4s": 7, "2_6s": 3,
+                     "2_30s": 1, "2_50s": 1},
+    "KD Karthik": {"3_Runs": 47, "3_Balls": 24, "3_SR": 195.83, "3_Average": 47, "3_BpB": 3.0,
+                   "3_4s": 6, "3_6s": 2, "3_30s": 1, "3_50s": 0},
+    "KA Pollard": {"5_Runs": 27, "5_Balls": 17, "5_SR": 158.82, "5_4s": 3, "5_6s": 1, "5_30s": 0},
+}
+
+
+def test_position_columns_match_baseline(fixture_store):
+    stats = compute_batting_stats(fixture_store)
+    _assert_pinned(stats, BASELINE_POSITIONS)
+    assert list(stats.columns[stats.columns.str.startswith("0_")][:3]) == ["0_Runs", "0_Balls", "0_SR"]
+    # Every batter here batted once, so all other positions are empty
+    for player, values in BASELINE_POSITIONS.items():
+        position = next(iter(values))[0]
+        other = [c for c in stats.columns if c[0].isdigit() and c[0] != position and c.endswith("_Runs")]
+        assert (stats.loc[player, other] == 0).all()
+
+
+def test_selected_positions_sum_their_columns(fixture_store):
+    stats = compute_batting_stats(fixture_store, selected_positions=["1", "2"])
+    _assert_pinned(stats, {
+        "SPD Smith": {"SelPos_Runs": 84, "SelPos_Balls": 54, "SelPos_Innings": 1, "SelPos_50s": 1},
+        "Yuvraj Singh": {"SelPos_Runs": 62, "SelPos_Balls": 27, "SelPos_Dismissals": 1, "SelPos_Average": 62},
+        "KD Karthik": {"SelPos_Runs": 0, "SelPos_Balls": 0, "SelPos_Innings": 0},
+    })
+    # No selection aggregates every position
+    everything = compute_batting_stats(fixture_store)
+    assert (everything["SelPos_Runs"] == everything[[f"{p}_Runs" for p in range(10)]].sum(axis=1)).all()
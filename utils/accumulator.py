@@ -0,0 +1,87 @@
+from array import array
+
+import numpy as np
+import pandas as pd
+
+# Counters kept for every player
+BATTING_COUNTERS = ("deliveries", "balls", "runs", "fours", "sixes", "dots", "dismissed")
+_DELIVERIES, _BALLS, _RUNS, _FOURS, _SIXES, _DOTS, _DISMISSED = range(len(BATTING_COUNTERS))
+
+
+class BattingAccumulator:
+    """
+    Batting counters for many players in one integer matrix (player x counter).
+    Players are interned to row numbers on first sight and the matrix doubles when full,
+    so add_delivery/add_dismissal only update existing cells instead of building dicts per ball.
+    The matrix is a flat int64 array; exports view it as a NumPy array without copying.
+    """
+
+    __slots__ = ("_rows", "_players", "_flat", "_capacity", "_width")
+
+    def __init__(self, capacity: int = 64):
+        self._rows = {}
+        self._players = []
+        self._width = len(BATTING_COUNTERS)
+        self._capacity = max(capacity, 1)
+        self._flat = array("q", bytes(8 * self._capacity * self._width))
+
+    def __len__(self):
+        return len(self._players)
+
+    @property
+    def players(self):
+        """Player names in the order they were first seen."""
+        return list(self._players)
+
+    def _base(self, player: str):
+        row = self._rows.get(player)
+        if row is None:
+            row = len(self._players)
+            if row == self._capacity:
+                self._flat.extend(array("q", bytes(8 * row * self._width)))
+                self._capacity = 2 * row
+            self._rows[player] = row
+            self._players.append(player)
+        return row * self._width
+
+    def add_delivery(self, batter: str, runs: int = 0, legal: bool = True):
+        """
+        Count one delivery faced by batter.
+        Args:
+            runs: runs off the bat
+            legal: False for wides/no-balls (counted in 'deliveries' but not in 'balls' or 'dots')
+        """
+        base = self._base(batter)
+        flat = self._flat
+        flat[base + _DELIVERIES] += 1
+        flat[base + _RUNS] += runs
+        if legal:
+            flat[base + _BALLS] += 1
+            if runs == 0:
+                flat[base + _DOTS] += 1
+        if runs == 4:
+            flat[base + _FOURS] += 1
+        elif runs == 6:
+            flat[base + _SIXES] += 1
+
+    def add_dismissal(self, player: str):
+        """Count a dismissal of player (on strike or not)."""
+        self._flat[self._base(player) + _DISMISSED] += 1
+
+    def totals(self):
+        """(players x counters) array of counters, rows in first-seen order, viewing the matrix without a copy."""
+        counts = np.frombuffer(self._flat, dtype=np.int64).reshape(self._capacity, self._width)
+        return counts[:len(self._players)]
+
+    def to_frame(self):
+        """
+        Export the counters.
+        Returns:
+            DataFrame indexed by player (in first-seen order) with a column per BATTING_COUNTERS entry
+        """
+        return pd.DataFrame(self.totals(), index=pd.Index(self._players, name="player"),
+                            columns=list(BATTING_COUNTERS))
+
+    def nbytes(self):
+        """Memory held by the counter matrix."""
+        return self._flat.itemsize * len(self._flat)
@@ -0,0 +1,279 @@
+"""
+Benchmark harness for the data pipeline, the stats engines and the plot builders.
+
+    python -m utils.benchmark --data-folder data --scale 1 --scale 10 --output bench.json
+
+Scales above 1 run against a synthetic copy of the folder in which every match file appears
+`scale` times (as symlinks under new match ids). Every stage reports wall time, peak memory
+and, where it processes deliveries, deliveries per second, as JSON. Memory is measured in the
+timed runs themselves (see measure). The store build's peak covers the parent process only;
+its ingest workers are reported separately as the peak resident set size of any worker process.
+The delivery store of a 100x run holds tens of millions of rows and needs several GB of memory.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from datetime import datetime, timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import pandas as pd
+
+from utils.data_loader import load_json_files, get_match_info, load_selected_dataset, load_match_catalog
+from utils.delivery_store import build_delivery_store, match_id_from_path
+from utils.stats_processor import (
+    compute_basic_stats,
+    compute_match_level_true_batting_stats,
+    compute_true_batting_stats,
+    compute_true_batting_stats_from_store,
+    compute_batting_stats,
+    compute_bowling_stats,
+    compute_true_batting_form,
+    rolling_true_batting,
+)
+from utils.visualizer import (
+    plot_runs_per_match,
+    plot_top_players,
+    plot_true_batting_stats,
+    plot_match_level_true_batting_stats,
+    plot_true_batting_form,
+    plot_bowling_stats,
+    plot_player_comparison,
+)
+
+DEFAULT_DATA_FOLDER = "data"
+# Per-match stages (full JSON parse + dict-based stats) run on at most this many files
+DEFAULT_MATCH_SAMPLE = 200
+
+
+def scale_folder(data_folder: str, scale: int, target: str):
+    """
+    Fill target with `scale` symlinked copies of every JSON file in data_folder, each under a new match id.
+    Returns: target
+    """
+    os.makedirs(target, exist_ok=True)
+    for f in load_json_files(data_folder):
+        source = os.path.abspath(os.path.join(data_folder, f))
+        stem = os.path.splitext(f)[0]
+        for k in range(scale):
+            os.symlink(source, os.path.join(target, f"{stem}_{k}.json"))
+    return target
+
+
+def _count_deliveries(dataset):
+    return sum(len(over.get("deliveries", [])) for inning in dataset.get("innings", []) for over in inning.get("overs", []))
+
+
+def _status_kb(field: str):
+    """A memory field of /proc/self/status (e.g. 'VmRSS', 'VmHWM') in kB."""
+    with open("/proc/self/status", "r") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise OSError(f"{field} not in /proc/self/status")
+
+
+def _reset_peak_rss():
+    """Reset this process's peak resident set size (Linux only). Returns False where unsupported."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        _status_kb("VmHWM")
+    except OSError:
+        return False
+    return True
+
+
+def measure(name: str, func, deliveries: int = None, repeat: int = 1, memory: bool = True):
+    """
+    Time func (best of `repeat` runs) and, with memory, measure the same runs' peak memory:
+    no stage runs more often than `repeat` times. On Linux the peak is the growth of the process's
+    resident set size, read from its reset high-water mark, which costs nothing while the stage runs;
+    allocations served from memory the process already holds are not counted. Elsewhere the runs are
+    traced with tracemalloc, which counts every allocation but slows Python-heavy stages.
+    Only this process is measured, so work done in worker processes is not included.
+    Returns: (result of the last run, dict with stage, wall_s, peak_mb, memory (the method:
+             'rss', 'tracemalloc' or None), deliveries and deliveries_per_sec)
+    """
+    method = None
+    if memory:
+        method = "rss" if _reset_peak_rss() else "tracemalloc"
+    wall = None
+    peak = None
+    result = None
+    if method == "tracemalloc":
+        tracemalloc.start()
+    try:
+        for _ in range(max(repeat, 1)):
+            # Drop the previous result so every run starts from the same baseline
+            result = None
+            if method == "rss":
+                _reset_peak_rss()
+                baseline = _status_kb("VmRSS") * 1024
+            elif method == "tracemalloc":
+                tracemalloc.reset_peak()
+                baseline = tracemalloc.get_traced_memory()[0]
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            wall = elapsed if wall is None else min(wall, elapsed)
+            if method is not None:
+                high = _status_kb("VmHWM") * 1024 if method == "rss" else tracemalloc.get_traced_memory()[1]
+                peak = max(peak or 0, high - baseline)
+    finally:
+        if method == "tracemalloc":
+            tracemalloc.stop()
+    peak_mb = peak / (1024 * 1024) if peak is not None else None
+    record = {"stage": name, "wall_s": round(wall, 6), "peak_mb": round(peak_mb, 3) if peak_mb is not None else None,
+              "memory": method}
+    return result, _set_deliveries(record, deliveries)
+
+
+def _set_deliveries(record, deliveries):
+    """Add the delivery count and throughput of a stage to its record."""
+    record["deliveries"] = deliveries
+    record["deliveries_per_sec"] = round(deliveries / record["wall_s"], 1) if deliveries and record["wall_s"] > 0 else None
+    return record
+
+
+def worker_peak_rss_mb():
+    """
+    Largest resident set size reached by any finished child process of this one, in MB
+    (None where the resource module is unavailable). The value only grows over the life of the process.
+    """
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return round(maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024), 3)
+
+
+def run_benchmark(data_folder: str, work_dir: str, match_sample: int = DEFAULT_MATCH_SAMPLE,
+                  repeat: int = 1, memory: bool = True, workers: int = None, log=print):
+    """
+    Run every stage against one data folder. Store and catalog files are written to work_dir.
+    Returns: dict with the folder's match and delivery counts and the list of stage results
+    """
+    log = log or (lambda message: None)
+    stages = []
+
+    def stage(name, func, deliveries=None):
+        result, record = measure(name, func, deliveries, repeat, memory)
+        log(f"  {name}: {record['wall_s']:.3f}s")
+        stages.append(record)
+        return result
+
+    files = stage("load_json_files", lambda: load_json_files(data_folder))
+    paths = [os.path.join(data_folder, f) for f in files]
+    stage("get_match_info (catalog build)", lambda: [get_match_info(p) for p in paths])
+    catalog_path = os.path.join(work_dir, "match_catalog.json")
+
+    def build_catalog():
+        if os.path.exists(catalog_path):
+            os.remove(catalog_path)
+        return load_match_catalog(data_folder, catalog_path)
+
+    match_infos, _ = stage("load_match_catalog (cold)", build_catalog)
+    stage("load_match_catalog (warm)", lambda: load_match_catalog(data_folder, catalog_path))
+
+    store_path = os.path.join(work_dir, "delivery_store.npz")
+    store, _ = stage("build_delivery_store", lambda: build_delivery_store(data_folder, store_path, workers))
+    total = len(store["deliveries"])
+    _set_deliveries(stages[-1], total)
+    stages[-1]["peak_scope"] = "parent process only"
+    stages[-1]["worker_peak_rss_mb"] = worker_peak_rss_mb()
+
+    sample = paths[:match_sample]
+    datasets = stage("load_selected_dataset", lambda: [load_selected_dataset(p) for p in sample])
+    sample_deliveries = sum(_count_deliveries(d) for d in datasets)
+    _set_deliveries(stages[-1], sample_deliveries)
+    basic = stage("compute_basic_stats", lambda: [compute_basic_stats(d) for d in datasets], sample_deliveries)
+    match_level = stage("compute_match_level_true_batting_stats",
+                        lambda: [compute_match_level_true_batting_stats(d) for d in datasets], sample_deliveries)
+    stage("compute_true_batting_stats", lambda: compute_true_batting_stats(datasets), sample_deliveries)
+
+    true_stats = stage("compute_true_batting_stats_from_store",
+                       lambda: compute_true_batting_stats_from_store(store), total)
+    batting = stage("compute_batting_stats", lambda: compute_batting_stats(store), total)
+    bowling = stage("compute_bowling_stats", lambda: compute_bowling_stats(store), total)
+    match_dates = {match_id_from_path(m["file_path"]): m["date"] for m in match_infos}
+    form = stage("compute_true_batting_form", lambda: compute_true_batting_form(store, match_dates), total)
+    rolling = stage("rolling_true_batting", lambda: rolling_true_batting(form, 10), total)
+
+    basic_df = pd.concat(basic, ignore_index=True) if basic else pd.DataFrame()
+    match_df = match_level[0] if match_level else pd.DataFrame()
+    form_players = true_stats["batter"].head(3).tolist()
+    stage("plot_runs_per_match", lambda: plot_runs_per_match(basic_df))
+    stage("plot_top_players", lambda: plot_top_players(basic_df))
+    stage("plot_true_batting_stats", lambda: plot_true_batting_stats(true_stats))
+    stage("plot_match_level_true_batting_stats", lambda: plot_match_level_true_batting_stats(match_df))
+    stage("plot_true_batting_form", lambda: plot_true_batting_form(rolling[rolling["batter"].isin(form_players)]))
+    stage("plot_bowling_stats", lambda: plot_bowling_stats(bowling[bowling["Wickets"] > 0]))
+    # Every batter of the folder is one point, well above the WebGL threshold on the full archive
+    comparison = batting.dropna(subset=["Runs", "SR"])
+    stage("plot_player_comparison", lambda: plot_player_comparison(
+        comparison, "Runs", "SR", "Runs", "Strike Rate", hover_cols=["Innings", "Average"]))
+    stages[-1]["points"] = len(comparison)
+
+    return {
+        "files": len(files),
+        "matches": len(match_infos),
+        "deliveries": total,
+        "sample_matches": len(sample),
+        "sample_deliveries": sample_deliveries,
+        "stages": stages,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.benchmark", description="Benchmark the stats pipeline.")
+    parser.add_argument("--data-folder", default=DEFAULT_DATA_FOLDER, help="Folder of Cricsheet JSON files")
+    parser.add_argument("--scale", dest="scales", type=int, action="append",
+                        help="Match multiplier for a synthetic scale-up (repeatable, default 1)")
+    parser.add_argument("--match-sample", type=int, default=DEFAULT_MATCH_SAMPLE,
+                        help="Files used by the per-match (full JSON) stages")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per stage; the fastest is reported")
+    parser.add_argument("--no-memory", action="store_true", help="Do not measure the peak memory of each stage")
+    parser.add_argument("--workers", type=int, help="Ingest processes for the store build (default: all cores)")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    log = lambda message: print(message, file=sys.stderr)
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "data_folder": os.path.abspath(args.data_folder),
+        "runs": [],
+    }
+    for scale in args.scales or [1]:
+        work_dir = tempfile.mkdtemp(prefix="cric_bench_")
+        try:
+            folder = args.data_folder if scale == 1 else scale_folder(args.data_folder, scale, os.path.join(work_dir, "data"))
+            log(f"Scale {scale}x ({folder})")
+            run = run_benchmark(folder, work_dir, args.match_sample, args.repeat, not args.no_memory, args.workers, log)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+        report["runs"].append({"scale": scale, **run})
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+import os
+import sys
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from utils.data_loader import get_catalog_path, load_selected_dataset
+from utils.delivery_store import load_delivery_store, match_id_from_path, get_store_path
+from utils.match_index import MatchIndex
+from utils.player_search import build_player_index
+from utils.stats_processor import compute_basic_stats, compute_true_batting_stats_from_store
+
+# Default limits for the shared in-process cache (override with configure_cache)
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# Sizes of cached values that are not frames, estimated from their structure (measured on IPL data)
+JSON_SIZE_FACTOR = 2        # A parsed match takes about twice its file size
+CATALOG_ROW_BYTES = 2048    # One match catalog row and its MatchIndex postings
+PLAYER_INDEX_BYTES = 2048   # One player's search keys and trigram postings in PlayerSearchIndex
+
+
+class LRUCache:
+    """
+    Bounded least-recently-used cache with hit/miss counters.
+    Entries are evicted oldest-first once either max_entries or max_bytes is exceeded.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return (True, value) on a hit, (False, None) on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, key, value, size: int = None):
+        """
+        Store a value, evicting least-recently-used entries to stay within limits.
+        Args:
+            size: bytes charged for the value (estimate_size(value) when None)
+        """
+        if size is None:
+            size = estimate_size(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            # Values larger than the whole budget are not worth caching
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            self._evict()
+
+    def _evict(self):
+        while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def resize(self, max_entries: int = None, max_bytes: int = None):
+        """Change the limits, evicting immediately if the cache is now over budget."""
+        with self._lock:
+            if max_entries is not None:
+                self.max_entries = max_entries
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Return a dict with entry count, bytes used, limits and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def estimate_size(value):
+    """
+    Approximate memory footprint of a cached value in bytes, read from its structure without serialising it.
+    Frames, Series and arrays are measured; other values count their shallow size only, so callers caching
+    nested objects should pass their own size to LRUCache.put.
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    return sys.getsizeof(value)
+
+
+def file_signature(file_path: str):
+    """(absolute path, mtime_ns, size) of a file; changes whenever the file is rewritten."""
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+
+
+def make_key(name: str, *parts):
+    """
+    Canonical content hash for a cache entry.
+    Parts are serialised as sorted-key JSON so equivalent filter states map to the same key.
+    """
+    payload = json.dumps([name, list(parts)], sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+# Shared cache for the Streamlit server process; module state survives reruns and sessions
+_cache = LRUCache()
+
+
+def get_cache():
+    """Return the shared cache instance."""
+    return _cache
+
+
+def configure_cache(max_entries: int = None, max_bytes: int = None):
+    """Set the limits of the shared cache."""
+    _cache.resize(max_entries, max_bytes)
+
+
+def cache_stats():
+    """Hit/miss counters and usage of the shared cache."""
+    return _cache.stats()
+
+
+def _cached(key, compute, size=None):
+    """Cached value of key, computed on a miss. size: optional callable(value) -> bytes charged for it."""
+    hit, value = _cache.get(key)
+    if not hit:
+        value = compute()
+        _cache.put(key, value, size(value) if size is not None else None)
+    # Hand out copies of frames so callers can format them freely without touching the cache
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    return value
+
+
+def cached_load_selected_dataset(file_path: str):
+    """load_selected_dataset() keyed by file path + mtime. The returned dict must not be mutated."""
+    signature = file_signature(file_path)
+    key = make_key("load_selected_dataset", signature)
+    return _cached(key, lambda: load_selected_dataset(file_path), size=lambda _: JSON_SIZE_FACTOR * signature[2])
+
+
+def cached_compute_basic_stats(file_path: str, team_filter=None, player_filter=None):
+    """compute_basic_stats() for one match file, keyed by the file and the filter state."""
+    key = make_key("compute_basic_stats", file_signature(file_path),
+                   {"team_filter": team_filter, "player_filter": player_filter})
+    return _cached(key, lambda: compute_basic_stats(cached_load_selected_dataset(file_path),
+                                                    team_filter, player_filter))
+
+
+def cached_compute_true_batting_stats(file_paths, top_n=25):
+    """
+    True batting stats over a set of match files, keyed by the files and top_n.
+    Computed from the columnar delivery store of the files' folder rather than by re-reading the JSON.
+
+    Returns:
+        (DataFrame, errors) where errors is a list of (file_path, error_message) for files that could not be read
+    """
+    signatures, errors = {}, []
+    for file_path in file_paths:
+        try:
+            signatures[file_path] = file_signature(file_path)
+        except OSError as e:
+            errors.append((file_path, str(e)))
+    key = make_key("compute_true_batting_stats", sorted(signatures.values()), {"top_n": top_n})
+
+    def compute():
+        if not signatures:
+            return pd.DataFrame()
+        store = load_delivery_store(os.path.dirname(next(iter(signatures))))
+        match_ids = [match_id_from_path(file_path) for file_path in signatures]
+        return compute_true_batting_stats_from_store(store, match_ids, top_n=top_n)
+
+    return _cached(key, compute), errors
+
+
+def cached_player_search_index(data_folder: str, store=None):
+    """
+    PlayerSearchIndex of the folder's delivery store, built once per store file.
+    Args:
+        store: the already loaded store of data_folder (loaded when None)
+    """
+    key = make_key("player_search_index", file_signature(get_store_path(data_folder)))
+    return _cached(key, lambda: build_player_index(store if store is not None else load_delivery_store(data_folder)),
+                   size=lambda index: PLAYER_INDEX_BYTES * len(index))
+
+
+def cached_match_index(data_folder: str, match_infos):
+    """
+    MatchIndex over the folder's match catalog, built once per catalog file and shared by every page.
+    Args:
+        match_infos: the load_match_catalog() rows of data_folder
+    """
+    try:
+        signature = file_signature(get_catalog_path(data_folder))
+    except OSError:
+        # No catalog on disk (read-only folder): nothing identifies the rows, so index them directly
+        return MatchIndex(match_infos)
+    key = make_key("match_index", signature, len(match_infos))
+    return _cached(key, lambda: MatchIndex(match_infos), size=lambda _: CATALOG_ROW_BYTES * len(match_infos))
@@ -1,18 +1,98 @@
 import os
+import re
 import json
 
+# Persistent catalog of get_match_info() results, stored next to the data folder
+CATALOG_FILENAME = "match_catalog.json"
+CATALOG_VERSION = 1
+
+# Initial read size for header-only parsing; Cricsheet 'meta' + 'info' blocks are a few KB
+HEADER_READ_SIZE = 8192
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r"[ \t\n\r]*")
+
 
 def load_json_files(data_folder: str):
     """Return list of JSON files in the folder."""
     return [f for f in os.listdir(data_folder) if f.endswith(".json")]
 
+def _decode_header(text: str, stop_key: str = "innings"):
+    """
+    Decode the top-level members of a JSON object that appear before stop_key.
+    Returns: dict of the decoded members, or None if text ends before stop_key is reached
+    Raises: ValueError if the text is not a JSON object
+    """
+    pos = _whitespace.match(text, 0).end()
+    if pos >= len(text):
+        return None
+    if text[pos:pos + 1] != "{":
+        raise ValueError("expected a JSON object")
+    pos = _whitespace.match(text, pos + 1).end()
+    members = {}
+    while pos < len(text):
+        if text[pos] == "}":
+            return members
+        try:
+            key, pos = _decoder.raw_decode(text, pos)
+            pos = _whitespace.match(text, pos).end()
+            if pos >= len(text):
+                # Buffer ends between a key and its ':'
+                return None
+            if text[pos:pos + 1] != ":":
+                raise ValueError("expected ':' after object key")
+            pos = _whitespace.match(text, pos + 1).end()
+            if key == stop_key:
+                return members
+            value, pos = _decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            # Value cut off by the end of the buffer
+            return None
+        pos = _whitespace.match(text, pos).end()
+        # A value must be followed by ',' or '}', otherwise a number may have been cut short
+        if pos >= len(text):
+            return None
+        if text[pos] == ",":
+            pos = _whitespace.match(text, pos + 1).end()
+        elif text[pos] != "}":
+            raise ValueError("expected ',' or '}' after object value")
+        members[key] = value
+    return None
+
+
+def _read_match_header(file_path: str):
+    """
+    Read only the part of a Cricsheet file before "innings" ('meta' and 'info').
+    Falls back to a full json.load when the file does not have the expected layout.
+    """
+    with open(file_path, "r") as f:
+        text = f.read(HEADER_READ_SIZE)
+        while True:
+            try:
+                header = _decode_header(text)
+            except ValueError:
+                header = None
+                break
+            if header is not None:
+                break
+            chunk = f.read(len(text))
+            if not chunk:
+                break
+            text += chunk
+
+    if header is None or "info" not in header:
+        with open(file_path, "r") as f:
+            return json.load(f)
+    return header
+
+
 def get_match_info(file_path: str):
     """
     Extracts detailed match info for filters and display.
+    Only the header of the file is decoded, the innings data is never parsed.
     Returns: dict with match details including date, teams, venue, etc.
     """
-    with open(file_path, "r") as f:
-        data = json.load(f)
+    data = _read_match_header(file_path)
     
     info = data.get("info", {})
     teams = info.get("teams", [])
@@ -60,3 +140,79 @@ def load_selected_dataset(file_path: str):
     with open(file_path, "r") as f:
         data = json.load(f)
     return data
+
+
+
+def get_catalog_path(data_folder: str):
+    """Return the path of the match catalog file that sits next to the data folder."""
+    parent = os.path.dirname(os.path.abspath(data_folder))
+    return os.path.join(parent, CATALOG_FILENAME)
+
+
+def _read_catalog(catalog_path: str):
+    """Read catalog entries from disk; a missing or unreadable catalog is treated as empty."""
+    try:
+        with open(catalog_path, "r") as f:
+            catalog = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if catalog.get("version") != CATALOG_VERSION:
+        return {}
+    return catalog.get("entries", {})
+
+
+def _write_catalog(catalog_path: str, entries: dict):
+    """Atomically replace the catalog file with the given entries."""
+    tmp_path = catalog_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump({"version": CATALOG_VERSION, "entries": entries}, f, separators=(",", ":"))
+    os.replace(tmp_path, catalog_path)
+
+
+def load_match_catalog(data_folder: str, catalog_path: str = None):
+    """
+    Return get_match_info() results for every JSON file in the folder using a persistent catalog.
+    Entries are keyed by filename and reused while the file's mtime and size are unchanged,
+    so only new or modified files are parsed. The catalog is rewritten only when something changed.
+    Returns: (list of match info dicts in folder order, list of (filename, error message) tuples)
+    """
+    if catalog_path is None:
+        catalog_path = get_catalog_path(data_folder)
+
+    cached = _read_catalog(catalog_path)
+    entries = {}
+    match_infos = []
+    errors = []
+    changed = False
+
+    for f in load_json_files(data_folder):
+        file_path = os.path.join(data_folder, f)
+        try:
+            stat = os.stat(file_path)
+        except OSError as e:
+            errors.append((f, str(e)))
+            continue
+
+        entry = cached.get(f)
+        if entry is None or entry.get("mtime") != stat.st_mtime_ns or entry.get("size") != stat.st_size:
+            try:
+                info = get_match_info(file_path)
+            except Exception as e:
+                errors.append((f, str(e)))
+                continue
+            info = {k: v for k, v in info.items() if k != "file_path"}
+            entry = {"mtime": stat.st_mtime_ns, "size": stat.st_size, "info": info}
+            changed = True
+
+        entries[f] = entry
+        match_infos.append({**entry["info"], "file_path": file_path})
+
+    # Drop entries for files that were removed from the folder
+    if changed or len(entries) != len(cached):
+        try:
+            _write_catalog(catalog_path, entries)
+        except OSError:
+            # A read-only deployment still works, it just re-parses on the next run
+            pass
+
+    return match_infos, errors
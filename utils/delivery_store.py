@@ -0,0 +1,682 @@
+import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from utils.data_loader import load_json_files, load_selected_dataset
+
+# Flat ball-by-ball store built once from the Cricsheet JSON, stored next to the data folder
+STORE_FILENAME = "delivery_store.npz"
+STORE_VERSION = 10
+
+# Files flattened per task during ingest; small enough to give a smooth progress bar
+INGEST_CHUNK_SIZE = 32
+
+# Over numbers are 0-based, so 15 means the 16th over
+DEATH_OVER_START = 15
+
+# Column layout of each table: name -> dtype ('str' columns are stored as codes + categories)
+DELIVERY_COLUMNS = {
+    "match_id": "str",
+    "innings": np.int8,       # 0-based index into the match's innings list
+    "team": "str",            # Batting team
+    "super_over": np.bool_,
+    "over": np.int16,         # 0-based over number as in Cricsheet
+    "ball": np.int16,         # 1-based position of the delivery within the over (extras included)
+    "batter": "str",
+    "bowler": "str",
+    "non_striker": "str",
+    "batter_runs": np.int16,
+    "extras": np.int16,       # Extra runs on this delivery
+    "total_runs": np.int16,
+    "extras_type": "str",     # e.g. 'wides', 'legbyes' or 'noballs|legbyes'; '' when no extras
+    "wides": np.int16,        # Wide runs (charged to the bowler, not a legal ball)
+    "noballs": np.int16,      # No-ball runs (charged to the bowler, not a legal ball)
+    "wickets": np.int8,       # Number of wickets that fell on this delivery
+    "wicket_kind": "str",     # Kind/player/fielders of the first wicket on this delivery ('' if none)
+    "player_out": "str",
+    "fielders": "str",        # Comma-separated fielder names
+    "score": np.int16,        # Innings total (runs.total) up to and including this delivery
+    "wickets_down": np.int8,  # Wickets fallen in the innings up to and including this delivery
+}
+
+# Fall of wickets, one row per wicket; 'delivery' is the row index into the deliveries table
+WICKET_COLUMNS = {
+    "delivery": np.int32,
+    "match_id": "str",
+    "innings": np.int8,
+    "team": "str",            # Batting team
+    "over": np.int16,
+    "ball": np.int16,
+    "kind": "str",
+    "player_out": "str",
+    "fielders": "str",
+    "batter": "str",          # Batter on strike
+    "non_striker": "str",
+    "bowler": "str",
+    "score": np.int16,        # Exact innings total when the wicket fell
+    "wicket_number": np.int8, # 1 for the first wicket of the innings, etc.
+}
+
+# Playing XI per match in team-sheet order (used for match counts and top-6 baselines)
+SQUAD_COLUMNS = {
+    "match_id": "str",
+    "team": "str",
+    "player": "str",
+    "order": np.int8,         # 0-based position in info.players[team]
+}
+
+# Cricsheet registry per match (info.registry.people): every named person and their registry identifier
+PEOPLE_COLUMNS = {
+    "match_id": "str",
+    "name": "str",            # Name as spelled in this match
+    "person": "str",          # Cricsheet registry identifier (8 hex digits), stable across spellings
+}
+
+# Per-innings batting scorecard, one row per (match, innings, batter), derived at ingest.
+# A batter's innings starts at their first legal ball (no extras of any kind); 'entry' is the
+# number of wickets fallen up to and including that delivery, or -1 if they never faced one.
+BATTING_INNINGS_COLUMNS = {
+    "match_id": "str",
+    "innings": np.int8,
+    "team": "str",
+    "batter": "str",
+    "deliveries": np.int16,   # Deliveries faced on strike, extras included
+    "runs": np.int16,
+    "balls": np.int16,        # Legal balls faced
+    "fours": np.int16,
+    "sixes": np.int16,
+    "dots": np.int16,
+    "legal_runs": np.int16,   # Runs off legal balls, used for 30/50/100 milestones
+    "entry": np.int8,
+    "dismissed": np.int8,
+    "dismissal_kind": "str",
+    "do_runs": np.int16,      # do_* columns: death overs only
+    "do_balls": np.int16,
+    "do_fours": np.int16,
+    "do_sixes": np.int16,
+    "do_dots": np.int16,
+    "do_dismissed": np.int8,
+    "pos_runs": np.int16,     # pos_* columns: from the first legal ball onwards (credited to 'entry')
+    "pos_fours": np.int16,
+    "pos_sixes": np.int16,
+    "pos_dismissed": np.int8,
+}
+
+# Additive batting rollup, one row per (match, batter, entry position, over), derived at ingest.
+# Every column sums across matches, so any match selection is answered by summing rows and
+# deriving ratios afterwards; any set of match phases is answered by summing over ranges.
+# Delivery and dismissal counters fall in the over of the delivery; per-innings counters
+# (innings, milestones) fall in the over where the innings began. Per-position counters are read
+# from the per-innings scorecard instead.
+BATTING_CUBE_COLUMNS = {
+    "match_id": "str",
+    "batter": "str",
+    "entry": np.int8,         # As in BATTING_INNINGS_COLUMNS (-1: never faced a legal ball)
+    "over": np.int8,          # 0-based over number; -1 for super overs, which belong to no phase
+    "deliveries": np.int16,
+    "runs": np.int16,
+    "balls": np.int16,
+    "fours": np.int16,
+    "sixes": np.int16,
+    "dots": np.int16,
+    "dismissed": np.int8,
+    "pos_runs": np.int16,     # pos_* columns: from the first legal ball onwards
+    "pos_fours": np.int16,
+    "pos_sixes": np.int16,
+    "pos_dismissed": np.int8,
+    "innings": np.int8,       # 1 on one row per (match, batter): matches batted in or dismissed in
+    "30s": np.int8,           # Milestones on runs off legal balls, for innings with a legal ball faced
+    "50s": np.int8,
+    "100s": np.int8,
+}
+
+# One row per person, derived at build time; player_id is the row number (see player_id_arrays)
+PLAYER_COLUMNS = {
+    "player_id": np.int32,
+    "person": "str",          # Cricsheet registry identifier ('' for names with no registry entry)
+    "name": "str",            # Display name: the person's most used spelling, unique across players
+}
+
+# Integer player id columns stored next to each name column: table -> {name column: id column}.
+# Ids index the players table; -1 marks an empty name (e.g. no player out).
+PLAYER_ID_COLUMNS = {
+    "deliveries": {"batter": "batter_id", "bowler": "bowler_id", "non_striker": "non_striker_id"},
+    "wickets": {"player_out": "player_out_id", "batter": "batter_id", "bowler": "bowler_id"},
+    "squads": {"player": "player_id"},
+    "batting_innings": {"batter": "batter_id"},
+    "batting_cube": {"batter": "batter_id"},
+}
+
+TABLES = {
+    "deliveries": DELIVERY_COLUMNS,
+    "wickets": WICKET_COLUMNS,
+    "squads": SQUAD_COLUMNS,
+    "people": PEOPLE_COLUMNS,
+    "batting_innings": BATTING_INNINGS_COLUMNS,
+    "batting_cube": BATTING_CUBE_COLUMNS,
+    "players": PLAYER_COLUMNS,
+}
+# Tables filled by flatten_match(); the rest are derived from them at build time
+RAW_TABLES = ("deliveries", "wickets", "squads", "people")
+
+
+def get_store_path(data_folder: str):
+    """Return the path of the delivery store file that sits next to the data folder."""
+    parent = os.path.dirname(os.path.abspath(data_folder))
+    return os.path.join(parent, STORE_FILENAME)
+
+
+def match_id_from_path(file_path: str):
+    """Match id used by the store: the Cricsheet file name without extension."""
+    return os.path.splitext(os.path.basename(file_path))[0]
+
+
+def _empty_columns(layout):
+    return {name: [] for name in layout}
+
+
+def flatten_match(dataset, match_id: str, tables=None):
+    """
+    Append one match's deliveries, wickets, playing XIs and registry entries to column lists.
+    Args:
+        dataset: Single match JSON data
+        match_id: Identifier stored in every row of this match
+        tables: dict of table name -> {column: list}; created when None
+    Returns:
+        The tables dict with this match's rows appended
+    """
+    if tables is None:
+        tables = {name: _empty_columns(TABLES[name]) for name in RAW_TABLES}
+    dl = tables["deliveries"]
+    wk = tables["wickets"]
+    sq = tables["squads"]
+    pp = tables["people"]
+
+    for team, players in dataset.get("info", {}).get("players", {}).items():
+        for order, player in enumerate(players):
+            sq["match_id"].append(match_id)
+            sq["team"].append(team)
+            sq["player"].append(player)
+            sq["order"].append(order)
+
+    for name, person in dataset.get("info", {}).get("registry", {}).get("people", {}).items():
+        pp["match_id"].append(match_id)
+        pp["name"].append(name)
+        pp["person"].append(person)
+
+    for inn_idx, inning in enumerate(dataset.get("innings", [])):
+        team = inning.get("team", "")
+        super_over = bool(inning.get("super_over", False))
+        # Running innings totals, so the score at any delivery is a single lookup
+        score = 0
+        wickets_down = 0
+        for over in inning.get("overs", []):
+            over_num = int(over.get("over", 0))
+            for ball_idx, delivery in enumerate(over.get("deliveries", []), start=1):
+                runs = delivery.get("runs", {})
+                extras = delivery.get("extras", {}) or {}
+                extras_type = "|".join(extras)
+                wickets = delivery.get("wickets", [])
+                row = len(dl["match_id"])
+                score += runs.get("total", 0)
+
+                for wicket in wickets:
+                    wickets_down += 1
+                    wk["delivery"].append(row)
+                    wk["match_id"].append(match_id)
+                    wk["innings"].append(inn_idx)
+                    wk["team"].append(team)
+                    wk["over"].append(over_num)
+                    wk["ball"].append(ball_idx)
+                    wk["kind"].append(wicket.get("kind", "unknown"))
+                    wk["player_out"].append(wicket.get("player_out", ""))
+                    wk["fielders"].append(",".join(f.get("name", "") for f in wicket.get("fielders", [])))
+                    wk["batter"].append(delivery.get("batter", ""))
+                    wk["non_striker"].append(delivery.get("non_striker", ""))
+                    wk["bowler"].append(delivery.get("bowler", ""))
+                    wk["score"].append(score)
+                    wk["wicket_number"].append(wickets_down)
+
+                first = wickets[0] if wickets else {}
+                dl["match_id"].append(match_id)
+                dl["innings"].append(inn_idx)
+                dl["team"].append(team)
+                dl["super_over"].append(super_over)
+                dl["over"].append(over_num)
+                dl["ball"].append(ball_idx)
+                dl["batter"].append(delivery.get("batter", ""))
+                dl["bowler"].append(delivery.get("bowler", ""))
+                dl["non_striker"].append(delivery.get("non_striker", ""))
+                dl["batter_runs"].append(runs.get("batter", 0))
+                dl["extras"].append(runs.get("extras", 0))
+                dl["total_runs"].append(runs.get("total", 0))
+                dl["extras_type"].append(extras_type)
+                dl["wides"].append(extras.get("wides", 0))
+                dl["noballs"].append(extras.get("noballs", 0))
+                dl["wickets"].append(len(wickets))
+                dl["wicket_kind"].append(first.get("kind", "unknown") if first else "")
+                dl["player_out"].append(first.get("player_out", ""))
+                dl["fielders"].append(",".join(f.get("name", "") for f in first.get("fielders", [])))
+                dl["score"].append(score)
+                dl["wickets_down"].append(wickets_down)
+
+    return tables
+
+
+def _batting_events(deliveries, wickets):
+    """
+    Per-delivery and per-wicket batting counters shared by the scorecard and the cube.
+    Returns: (delivery frame, wicket frame, innings starts frame with 'start_row' and 'entry')
+    """
+    key = ["match_id", "innings", "batter"]
+    d = pd.DataFrame({
+        "row": np.arange(len(deliveries)),
+        "match_id": deliveries["match_id"].astype(str).to_numpy(),
+        "innings": deliveries["innings"].to_numpy(),
+        "team": deliveries["team"].astype(str).to_numpy(),
+        "batter": deliveries["batter"].astype(str).to_numpy(),
+        "wkts": deliveries["wickets_down"].to_numpy(),
+        "over": np.where(deliveries["super_over"].to_numpy(), -1, deliveries["over"].to_numpy()),
+    })
+
+    runs = deliveries["batter_runs"].to_numpy().astype(np.int64)
+    legal = (deliveries["extras_type"] == "").to_numpy()
+    death = (deliveries["over"] >= DEATH_OVER_START).to_numpy()
+    four = runs == 4
+    six = runs == 6
+    dot = legal & (runs == 0)
+
+    starts = (d[legal].groupby(key, sort=False)
+              .agg(start_row=("row", "first"), entry=("wkts", "first"))
+              .reset_index())
+    start_row = d[key].merge(starts, on=key, how="left")["start_row"].fillna(np.inf).to_numpy()
+    started = d["row"].to_numpy() >= start_row
+
+    d["deliveries"] = 1
+    d["runs"] = runs
+    d["balls"] = legal.astype(np.int64)
+    d["fours"] = four.astype(np.int64)
+    d["sixes"] = six.astype(np.int64)
+    d["dots"] = dot.astype(np.int64)
+    d["legal_runs"] = np.where(legal, runs, 0)
+    d["do_runs"] = np.where(death, runs, 0)
+    d["do_balls"] = (legal & death).astype(np.int64)
+    d["do_fours"] = (four & death).astype(np.int64)
+    d["do_sixes"] = (six & death).astype(np.int64)
+    d["do_dots"] = (dot & death).astype(np.int64)
+    d["pos_runs"] = np.where(started, runs, 0)
+    d["pos_fours"] = (four & started).astype(np.int64)
+    d["pos_sixes"] = (six & started).astype(np.int64)
+
+    # Dismissals go to the player out; they count for the position only if that innings had already started
+    w = pd.DataFrame({
+        "row": wickets["delivery"].to_numpy(),
+        "match_id": wickets["match_id"].astype(str).to_numpy(),
+        "innings": wickets["innings"].to_numpy(),
+        "team": wickets["team"].astype(str).to_numpy(),
+        "batter": wickets["player_out"].astype(str).to_numpy(),
+        "dismissal_kind": wickets["kind"].astype(str).to_numpy(),
+        # Wickets take the super-over flag of the delivery they fell on
+        "over": np.where(deliveries["super_over"].to_numpy()[wickets["delivery"].to_numpy()], -1,
+                         wickets["over"].to_numpy()),
+        "do_dismissed": (wickets["over"] >= DEATH_OVER_START).to_numpy().astype(np.int64),
+    })
+    w_start = w[key].merge(starts, on=key, how="left")["start_row"].fillna(np.inf).to_numpy()
+    w["pos_dismissed"] = (w["row"].to_numpy() > w_start).astype(np.int64)
+    w["dismissed"] = 1
+    return d, w, starts
+
+
+def build_batting_innings(deliveries, wickets):
+    """
+    Derive the per-innings batting scorecard from the flat delivery and wicket tables.
+    Batters who were dismissed without facing a delivery (e.g. run out at the non-striker's end) get a row too.
+    Returns: DataFrame with the BATTING_INNINGS_COLUMNS layout
+    """
+    key = ["match_id", "innings", "batter"]
+    d, w, starts = _batting_events(deliveries, wickets)
+    counters = ["deliveries", "runs", "balls", "fours", "sixes", "dots", "legal_runs", "do_runs", "do_balls",
+                "do_fours", "do_sixes", "do_dots", "pos_runs", "pos_fours", "pos_sixes"]
+    innings = d.groupby(key, sort=False).agg(team=("team", "first"), **{c: (c, "sum") for c in counters}).reset_index()
+
+    outs = w.groupby(key, sort=False).agg(
+        out_team=("team", "first"), dismissed=("dismissed", "sum"), dismissal_kind=("dismissal_kind", "first"),
+        do_dismissed=("do_dismissed", "sum"), pos_dismissed=("pos_dismissed", "sum")).reset_index()
+
+    innings = innings.merge(outs, on=key, how="outer", sort=False)
+    innings = innings.merge(starts[key + ["entry"]], on=key, how="left", sort=False)
+    innings["team"] = innings["team"].fillna(innings["out_team"])
+    innings["dismissal_kind"] = innings["dismissal_kind"].fillna("")
+    innings["entry"] = innings["entry"].fillna(-1)
+    numeric = counters + ["dismissed", "do_dismissed", "pos_dismissed"]
+    innings[numeric] = innings[numeric].fillna(0)
+    return innings[list(BATTING_INNINGS_COLUMNS)]
+
+
+def build_batting_cube(deliveries, wickets):
+    """
+    Roll the delivery and wicket tables up into the additive batting cube.
+    Returns: DataFrame with the BATTING_CUBE_COLUMNS layout
+    """
+    key = ["match_id", "innings", "batter"]
+    cube_key = ["match_id", "batter", "entry", "over"]
+    d, w, starts = _batting_events(deliveries, wickets)
+    d = d.merge(starts[key + ["entry"]], on=key, how="left", sort=False)
+    w = w.merge(starts[key + ["entry"]], on=key, how="left", sort=False)
+    d["entry"] = d["entry"].fillna(-1)
+    w["entry"] = w["entry"].fillna(-1)
+
+    # Per-innings counters sit on the innings' first event: its first delivery, else the dismissal
+    events = pd.concat([d[key + ["row", "over", "entry", "legal_runs"]],
+                        w[key + ["row", "over", "entry"]].assign(legal_runs=0)], ignore_index=True)
+    events = events.sort_values("row", kind="stable")
+    innings = events.groupby(key, sort=False).agg(
+        over=("over", "first"), entry=("entry", "first"), legal_runs=("legal_runs", "sum")).reset_index()
+    faced = innings["entry"].to_numpy() >= 0
+    for m in (30, 50, 100):
+        innings[f"{m}s"] = (faced & (innings["legal_runs"].to_numpy() >= m)).astype(np.int64)
+    # Super-over innings do not add a second innings for the match
+    innings["innings"] = (~innings.duplicated(["match_id", "batter"])).astype(np.int64)
+
+    delivery_counters = ["deliveries", "runs", "balls", "fours", "sixes", "dots", "pos_runs", "pos_fours", "pos_sixes"]
+    parts = [d[cube_key + delivery_counters],
+             w[cube_key + ["dismissed", "pos_dismissed"]],
+             innings[cube_key + ["innings", "30s", "50s", "100s"]]]
+    cube = pd.concat(parts, ignore_index=True, sort=False)
+    counters = [c for c in BATTING_CUBE_COLUMNS if c not in cube_key]
+    cube[counters] = cube[counters].fillna(0)
+    cube = cube.groupby(cube_key, sort=False)[counters].sum().reset_index()
+    return cube[list(BATTING_CUBE_COLUMNS)]
+
+
+def fall_of_wickets(store, match_ids=None):
+    """
+    Return the fall-of-wicket table for the given matches (all when None).
+    Adds a 'score_text' column such as 'Mumbai Indians 45-2' giving the exact score when each wicket fell.
+    """
+    wickets = store["wickets"]
+    if match_ids is not None:
+        wickets = wickets[wickets["match_id"].isin(list(match_ids))]
+    fow = wickets.copy()
+    fow["score_text"] = (fow["team"].astype(str) + " " + fow["score"].astype(str)
+                         + "-" + fow["wicket_number"].astype(str))
+    return fow
+
+
+def score_at_wicket(store, match_id: str, innings: int, wicket_number: int):
+    """
+    Exact innings score when the given wicket fell.
+    Returns: (runs, wickets) tuple, or None if the innings has no such wicket
+    """
+    wickets = store["wickets"]
+    hit = wickets[(wickets["match_id"] == match_id) & (wickets["innings"] == innings)
+                  & (wickets["wicket_number"] == wicket_number)]
+    if hit.empty:
+        return None
+    return int(hit["score"].iloc[0]), int(hit["wicket_number"].iloc[0])
+
+
+def _folder_signature(data_folder: str, files):
+    """Hash of (filename, mtime, size) for every file, used to detect a stale store."""
+    digest = hashlib.sha1()
+    for f in sorted(files):
+        stat = os.stat(os.path.join(data_folder, f))
+        digest.update(f"{f}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    return digest.hexdigest()
+
+
+def _to_arrays(table_name, columns):
+    """Convert column lists to the flat NumPy arrays written to the store."""
+    arrays = {}
+    for name, dtype in TABLES[table_name].items():
+        key = f"{table_name}/{name}"
+        if dtype == "str":
+            codes, categories = pd.factorize(pd.Series(columns[name], dtype=object))
+            arrays[f"{key}/codes"] = codes.astype(np.int32)
+            arrays[f"{key}/categories"] = np.asarray(categories, dtype=str)
+        else:
+            arrays[key] = np.asarray(columns[name], dtype=dtype)
+    return arrays
+
+
+def _to_frames(arrays, tables=None):
+    """Rebuild DataFrames (string columns as categoricals) from stored arrays."""
+    frames = {}
+    for table_name in tables or TABLES:
+        layout = TABLES[table_name]
+        data = {}
+        for name, dtype in layout.items():
+            key = f"{table_name}/{name}"
+            if dtype == "str":
+                data[name] = pd.Categorical.from_codes(arrays[f"{key}/codes"], categories=arrays[f"{key}/categories"])
+            else:
+                data[name] = arrays[key]
+        for id_col in PLAYER_ID_COLUMNS.get(table_name, {}).values():
+            if f"{table_name}/{id_col}" in arrays:
+                data[id_col] = arrays[f"{table_name}/{id_col}"]
+        frames[table_name] = pd.DataFrame(data)
+    return frames
+
+
+def player_id_arrays(frames):
+    """
+    Resolve every name column of the frames to a dense integer player id through the Cricsheet registry.
+    A name is looked up among its own match's registry entries, so the spellings one person has in
+    different files share an id while two people with the same name keep separate ids. Names with no
+    registry entry are identified by the name alone. Ids follow the sorted registry identifiers,
+    so they do not depend on file order.
+    Args:
+        frames: dict of DataFrames including 'people' and any of the PLAYER_ID_COLUMNS tables
+    Returns:
+        dict of arrays: '{table}/{id column}' (int32) for each table present, plus the 'players' table
+    """
+    people = frames["people"][["match_id", "name", "person"]].astype(str)
+    # Distinct (match, name) pairs of every name column; rows map back to their pair through `inverse`
+    refs, pairs = [], []
+    for table_name, columns in PLAYER_ID_COLUMNS.items():
+        if table_name not in frames:
+            continue
+        df = frames[table_name]
+        match = df["match_id"].astype("category")
+        for name_col, id_col in columns.items():
+            names = df[name_col].astype("category")
+            n_names = max(len(names.cat.categories), 1)
+            pair = match.cat.codes.to_numpy().astype(np.int64) * n_names + names.cat.codes.to_numpy()
+            unique, inverse = np.unique(pair, return_inverse=True)
+            refs.append((f"{table_name}/{id_col}", len(unique), inverse))
+            pairs.append(pd.DataFrame({"match_id": np.asarray(match.cat.categories, dtype=object)[unique // n_names],
+                                       "name": np.asarray(names.cat.categories, dtype=object)[unique % n_names]}))
+    pairs = pd.concat(pairs, ignore_index=True) if pairs else pd.DataFrame(columns=["match_id", "name"])
+    pairs = pairs.astype(str).merge(people, on=["match_id", "name"], how="left")
+    # '~' sorts after the hex registry identifiers, so unregistered names get the last ids
+    pairs["key"] = pairs["person"].fillna("~" + pairs["name"])
+    pairs.loc[pairs["name"] == "", "key"] = ""
+
+    keys, key_ids = np.unique(pairs["key"].to_numpy(dtype=str), return_inverse=True)
+    has_blank = len(keys) > 0 and keys[0] == ""
+    pair_ids = key_ids - int(has_blank)
+    keys = keys[int(has_blank):]
+
+    # Display name: the spelling used in the most matches (ties go to the last name alphabetically)
+    spellings = pairs.assign(player_id=pair_ids)[["player_id", "match_id", "name"]].drop_duplicates()
+    spellings = spellings[spellings["player_id"] >= 0]
+    counts = spellings.groupby(["player_id", "name"]).size().rename("n").reset_index()
+    names = (counts.sort_values(["player_id", "n", "name"], kind="stable")
+             .groupby("player_id")["name"].last().reindex(range(len(keys))))
+    persons = np.where(np.char.startswith(keys.astype(str), "~"), "", keys)
+    clash = names.duplicated(keep=False).to_numpy()
+    names = names.to_numpy(dtype=object)
+    names[clash] = [f"{name} ({person or 'unregistered'})" for name, person in zip(names[clash], persons[clash])]
+
+    arrays = {}
+    offset = 0
+    for key, n_unique, inverse in refs:
+        arrays[key] = pair_ids[offset:offset + n_unique][inverse].astype(np.int32)
+        offset += n_unique
+    arrays.update(_to_arrays("players", {"player_id": np.arange(len(keys)), "person": persons, "name": names}))
+    return arrays
+
+
+def player_names(store, player_ids):
+    """Display names (object array) of integer player ids, from the store's players table."""
+    return np.asarray(store["players"]["name"], dtype=object)[np.asarray(player_ids, dtype=np.int64)]
+
+
+def _flatten_files(data_folder: str, files):
+    """
+    Ingest worker: flatten a shard of JSON files into compact per-table arrays.
+    Returns: (dict of arrays as produced by _to_arrays for the raw tables, list of (filename, error message))
+    """
+    tables = {name: _empty_columns(TABLES[name]) for name in RAW_TABLES}
+    errors = []
+    for f in files:
+        file_path = os.path.join(data_folder, f)
+        try:
+            dataset = load_selected_dataset(file_path)
+        except Exception as e:
+            errors.append((f, str(e)))
+            continue
+        flatten_match(dataset, match_id_from_path(file_path), tables)
+
+    arrays = {}
+    for table_name, columns in tables.items():
+        arrays.update(_to_arrays(table_name, columns))
+    return arrays, errors
+
+
+# Columns holding row indices into another table: stored key -> referenced table
+ROW_REFERENCES = {"wickets/delivery": "deliveries"}
+
+
+def _merge_arrays(shards, tables=RAW_TABLES):
+    """
+    Concatenate shard arrays in order. String columns get a merged category list
+    and each shard's codes are remapped onto it.
+    """
+    arrays = {}
+    for table_name in tables:
+        for name, dtype in TABLES[table_name].items():
+            key = f"{table_name}/{name}"
+            if dtype == "str":
+                categories = pd.Index(np.concatenate([shard[f"{key}/categories"] for shard in shards])).unique()
+                codes = [categories.get_indexer(shard[f"{key}/categories"])[shard[f"{key}/codes"]]
+                         if len(shard[f"{key}/codes"]) else shard[f"{key}/codes"]
+                         for shard in shards]
+                arrays[f"{key}/codes"] = np.concatenate(codes).astype(np.int32)
+                arrays[f"{key}/categories"] = np.asarray(categories, dtype=str)
+            elif key in ROW_REFERENCES:
+                # Row indices are local to each shard, so shift them past the preceding shards' rows
+                ref = f"{ROW_REFERENCES[key]}/match_id/codes"
+                offsets = np.cumsum([0] + [len(shard[ref]) for shard in shards[:-1]])
+                arrays[key] = np.concatenate([shard[key] + offset for shard, offset in zip(shards, offsets)]).astype(dtype)
+            else:
+                arrays[key] = np.concatenate([shard[key] for shard in shards]).astype(dtype)
+    return arrays
+
+
+def _flatten_folder(data_folder: str, files, workers: int = None, progress=None):
+    """
+    Flatten all files, sharding them across a process pool when more than one worker is used.
+    Shard results are merged in file order so the store is identical for any worker count.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = [files[i:i + INGEST_CHUNK_SIZE] for i in range(0, len(files), INGEST_CHUNK_SIZE)] or [[]]
+    results = [None] * len(chunks)
+    done = 0
+
+    if workers <= 1 or len(chunks) == 1:
+        for i, chunk in enumerate(chunks):
+            results[i] = _flatten_files(data_folder, chunk)
+            done += len(chunk)
+            if progress is not None:
+                progress(done, len(files))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(_flatten_files, data_folder, chunk): i for i, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i] = future.result()
+                done += len(chunks[i])
+                if progress is not None:
+                    progress(done, len(files))
+
+    arrays = _merge_arrays([shard for shard, _ in results])
+    errors = [error for _, shard_errors in results for error in shard_errors]
+    return arrays, errors
+
+
+def frames_from_tables(tables):
+    """
+    Convert column lists filled by flatten_match() into DataFrames shaped like the stored tables,
+    with player id columns and the players table when the registry ('people') is included.
+    """
+    arrays = {}
+    for table_name, columns in tables.items():
+        arrays.update(_to_arrays(table_name, columns))
+    frames = _to_frames(arrays, tables=list(tables))
+    if "people" in frames:
+        arrays.update(player_id_arrays(frames))
+        frames = _to_frames(arrays, tables=list(tables) + ["players"])
+    return frames
+
+
+def build_delivery_store(data_folder: str, store_path: str = None, workers: int = None, progress=None):
+    """
+    Flatten every JSON file in the folder into the columnar store and write it to disk.
+    Args:
+        data_folder: Folder of Cricsheet JSON files
+        store_path: Where to write the store (defaults to get_store_path)
+        workers: Number of ingest processes (defaults to the number of cores, 1 runs in-process)
+        progress: Optional callable(files_done, files_total) called as shards complete
+    Returns: (dict of DataFrames 'deliveries', 'wickets', 'squads', 'people', 'batting_innings', 'batting_cube',
+              'players', list of (filename, error message))
+    """
+    if store_path is None:
+        store_path = get_store_path(data_folder)
+
+    files = load_json_files(data_folder)
+    arrays, errors = _flatten_folder(data_folder, files, workers, progress)
+    frames = _to_frames(arrays, tables=RAW_TABLES)
+    frames["batting_innings"] = build_batting_innings(frames["deliveries"], frames["wickets"])
+    frames["batting_cube"] = build_batting_cube(frames["deliveries"], frames["wickets"])
+    arrays.update(_to_arrays("batting_innings", frames["batting_innings"]))
+    arrays.update(_to_arrays("batting_cube", frames["batting_cube"]))
+    arrays.update(player_id_arrays(frames))
+    arrays["version"] = np.asarray(STORE_VERSION)
+    arrays["signature"] = np.asarray(_folder_signature(data_folder, files))
+
+    # np.savez appends '.npz' to names without it, so write through a file handle
+    tmp_path = store_path + ".tmp"
+    with open(tmp_path, "wb") as fh:
+        np.savez(fh, **arrays)
+    os.replace(tmp_path, store_path)
+
+    return _to_frames(arrays), errors
+
+
+def load_delivery_store(data_folder: str, store_path: str = None, rebuild: bool = False,
+                        workers: int = None, progress=None):
+    """
+    Return the columnar delivery store for the folder, rebuilding it when any file changed.
+    workers and progress are passed to build_delivery_store when a rebuild is needed.
+    Returns: dict of DataFrames with keys 'deliveries', 'wickets', 'squads', 'people', 'batting_innings',
+             'batting_cube' and 'players'
+    """
+    if store_path is None:
+        store_path = get_store_path(data_folder)
+
+    if not rebuild:
+        try:
+            with np.load(store_path) as npz:
+                arrays = {k: npz[k] for k in npz.files}
+        except (OSError, ValueError):
+            arrays = None
+        if arrays is not None and int(arrays.get("version", -1)) == STORE_VERSION:
+            signature = _folder_signature(data_folder, load_json_files(data_folder))
+            if str(arrays["signature"]) == signature:
+                return _to_frames(arrays)
+
+    frames, _ = build_delivery_store(data_folder, store_path, workers, progress)
+    return frames
@@ -0,0 +1,188 @@
+"""
+Headless export of the app's stats tables, for precomputing them outside a browser session.
+
+    python -m utils.export --data-folder data --output-dir exports --tournament "Indian Premier League" \
+        --season 2023 --season 2024 --format csv --format parquet
+
+Writes batting_stats, bowling_stats, true_batting_stats and basic_stats (compute_basic_stats of every
+selected match) plus a manifest.json describing the filters and the files written.
+"""
+import os
+import sys
+import json
+import argparse
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from utils.data_loader import load_match_catalog, load_selected_dataset
+from utils.delivery_store import STORE_VERSION, INGEST_CHUNK_SIZE, load_delivery_store, match_id_from_path
+from utils.match_index import MatchIndex
+from utils.stats_processor import (
+    compute_basic_stats,
+    compute_batting_stats,
+    compute_bowling_stats,
+    compute_true_batting_stats_from_store,
+)
+
+DEFAULT_DATA_FOLDER = "data"
+EXPORT_FORMATS = ("csv", "parquet")
+MANIFEST_FILENAME = "manifest.json"
+
+
+def select_matches(match_infos, tournament=None, seasons=None, teams=None):
+    """
+    Catalog rows matching the export filters, with the same semantics as the sidebar filters.
+    Args:
+        match_infos: match catalog rows from load_match_catalog
+        tournament: tournament name (all when None)
+        seasons: list of years (all when empty)
+        teams: list of teams that must all have played (two teams give their head-to-head games)
+    Returns:
+        list of match infos in catalog order
+    """
+    return MatchIndex(match_infos).filter({
+        "tournament": tournament,
+        "year": [int(s) for s in seasons or []],
+        "team": list(teams or []),
+    })
+
+
+def _basic_stats_chunk(file_paths):
+    """Worker: compute_basic_stats for each file, tagged with its match id."""
+    frames, errors = [], []
+    for file_path in file_paths:
+        try:
+            df = compute_basic_stats(load_selected_dataset(file_path))
+        except Exception as e:
+            errors.append((file_path, str(e)))
+            continue
+        df.insert(0, "match_id", match_id_from_path(file_path))
+        frames.append(df)
+    return frames, errors
+
+
+def compute_basic_stats_parallel(file_paths, workers: int = None):
+    """
+    compute_basic_stats for many match files, fanned out across a process pool.
+    Returns: (one DataFrame with a match_id column, list of (file_path, error_message))
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = [file_paths[i:i + INGEST_CHUNK_SIZE] for i in range(0, len(file_paths), INGEST_CHUNK_SIZE)]
+    if workers <= 1 or len(chunks) <= 1:
+        results = [_basic_stats_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map keeps chunk order, so the output is identical for any worker count
+            results = list(executor.map(_basic_stats_chunk, chunks))
+    frames = [df for chunk_frames, _ in results for df in chunk_frames]
+    errors = [error for _, chunk_errors in results for error in chunk_errors]
+    return (pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()), errors
+
+
+def write_table(df, output_dir: str, name: str, formats=("csv",)):
+    """
+    Write a table once per format as <output_dir>/<name>.<format>; a named index becomes a column.
+    Returns: list of written paths
+    """
+    if df.index.name is not None:
+        df = df.reset_index()
+    paths = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        if fmt == "csv":
+            df.to_csv(path, index=False)
+        elif fmt == "parquet":
+            try:
+                df.to_parquet(path, index=False)
+            except ImportError as e:
+                raise RuntimeError(f"Parquet export needs pyarrow or fastparquet installed: {e}")
+        else:
+            raise ValueError(f"Unknown export format: {fmt}")
+        paths.append(path)
+    return paths
+
+
+def export_stats(data_folder: str, output_dir: str, tournament=None, seasons=None, teams=None,
+                 formats=("csv",), workers: int = None, top_n: int = 25, log=print):
+    """
+    Compute and write every exported table for the matches selected by the filters.
+    Args:
+        data_folder: Folder of Cricsheet JSON files
+        output_dir: Folder the tables and manifest are written to (created if missing)
+        tournament, seasons, teams: match filters (see select_matches)
+        formats: any of EXPORT_FORMATS
+        workers: processes for building the store and for the per-match stats (all cores when None)
+        top_n: number of top run scorers in the true-stats table
+        log: callable for progress messages (None for silence)
+    Returns:
+        The manifest dict that was written to output_dir/manifest.json
+    """
+    log = log or (lambda message: None)
+    os.makedirs(output_dir, exist_ok=True)
+
+    match_infos, catalog_errors = load_match_catalog(data_folder)
+    matches = select_matches(match_infos, tournament, seasons, teams)
+    log(f"{len(matches)} of {len(match_infos)} matches selected")
+    file_paths = [m["file_path"] for m in matches]
+    match_ids = [match_id_from_path(f) for f in file_paths]
+
+    store = load_delivery_store(data_folder, workers=workers)
+    tables = {
+        "batting_stats": compute_batting_stats(store, match_ids),
+        "bowling_stats": compute_bowling_stats(store, match_ids),
+        "true_batting_stats": compute_true_batting_stats_from_store(store, match_ids, top_n=top_n),
+    }
+    log("Computing per-match basic stats")
+    tables["basic_stats"], basic_errors = compute_basic_stats_parallel(file_paths, workers)
+
+    written = {}
+    for name, df in tables.items():
+        written[name] = write_table(df, output_dir, name, formats)
+        log(f"{name}: {len(df)} rows -> {', '.join(written[name])}")
+
+    manifest = {
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "data_folder": os.path.abspath(data_folder),
+        "store_version": STORE_VERSION,
+        "filters": {"tournament": tournament, "seasons": [int(s) for s in seasons or []], "teams": list(teams or [])},
+        "matches": len(matches),
+        "tables": {name: {"rows": len(tables[name]), "files": [os.path.basename(p) for p in paths]}
+                   for name, paths in written.items()},
+        "errors": [{"file": f, "error": err} for f, err in catalog_errors + basic_errors],
+    }
+    with open(os.path.join(output_dir, MANIFEST_FILENAME), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m utils.export", description="Export cricket stats tables.")
+    parser.add_argument("--data-folder", default=DEFAULT_DATA_FOLDER, help="Folder of Cricsheet JSON files")
+    parser.add_argument("--output-dir", default="exports", help="Folder to write the tables to")
+    parser.add_argument("--tournament", help="Only matches of this tournament")
+    parser.add_argument("--season", dest="seasons", action="append", default=[], help="Season year (repeatable)")
+    parser.add_argument("--team", dest="teams", action="append", default=[],
+                        help="Team that must have played (repeatable; two teams give their head-to-head games)")
+    parser.add_argument("--format", dest="formats", action="append", choices=EXPORT_FORMATS,
+                        help="Output format (repeatable, default csv)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: all cores)")
+    parser.add_argument("--top-n", type=int, default=25, help="Top run scorers in the true stats table")
+    args = parser.parse_args(argv)
+
+    try:
+        manifest = export_stats(args.data_folder, args.output_dir, args.tournament, args.seasons, args.teams,
+                                args.formats or ["csv"], args.workers, args.top_n,
+                                log=lambda message: print(message, file=sys.stderr))
+    except (OSError, RuntimeError, ValueError) as e:
+        print(f"Export failed: {e}", file=sys.stderr)
+        return 1
+    for error in manifest["errors"]:
+        print(f"Error loading file {error['file']}: {error['error']}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+from collections import defaultdict
+
+# Match catalog fields that can be filtered on
+FACETS = ("tournament", "year", "team", "venue", "date", "city")
+
+# Multi-valued facets where a selection of several values means every one must match
+# (picking Team 1 and Team 2 finds their head-to-head games)
+MATCH_ALL_FACETS = {"team"}
+
+
+def _facet_values(match_info, facet):
+    if facet == "team":
+        return match_info.get("teams", [])
+    return [match_info.get(facet)]
+
+
+def _is_unset(selection):
+    return selection is None or selection == "All" or (isinstance(selection, (list, tuple, set)) and not selection)
+
+
+class MatchIndex:
+    """
+    Inverted index over the match catalog for the sidebar filter cascades.
+    Holds one posting set of catalog rows per facet value, so a filter combination is answered
+    by set intersections instead of re-scanning every match.
+    """
+
+    def __init__(self, match_infos):
+        self.match_infos = list(match_infos)
+        self._all = frozenset(range(len(self.match_infos)))
+        self._postings = {facet: defaultdict(set) for facet in FACETS}
+        for row, match_info in enumerate(self.match_infos):
+            for facet in FACETS:
+                for value in _facet_values(match_info, facet):
+                    # Empty values are never offered as options, matching the sidebar behaviour
+                    if value:
+                        self._postings[facet][value].add(row)
+
+    def values(self, facet: str, rows=None):
+        """Sorted option values of a facet that occur in the given rows (all rows when None)."""
+        postings = self._postings[facet]
+        if rows is None or len(rows) == len(self._all):
+            return sorted(postings)
+        return sorted(value for value, posting in postings.items() if not posting.isdisjoint(rows))
+
+    def rows(self, facet: str, selection):
+        """
+        Catalog rows matching a selection on one facet.
+        A list selects any of its values, except for MATCH_ALL_FACETS where all must match.
+        """
+        if _is_unset(selection):
+            return self._all
+        postings = self._postings[facet]
+        if not isinstance(selection, (list, tuple, set)):
+            return postings.get(selection, set())
+        matched = [postings.get(value, set()) for value in selection]
+        if facet in MATCH_ALL_FACETS:
+            return set.intersection(*matched)
+        return set().union(*matched)
+
+    def filter(self, selections: dict):
+        """Return the match infos (in catalog order) that satisfy every facet selection."""
+        current = self._all
+        for facet, selection in selections.items():
+            if not _is_unset(selection):
+                current = current & self.rows(facet, selection)
+        return [self.match_infos[row] for row in sorted(current)]
+
+    def cascade(self, selections: dict, order=FACETS):
+        """
+        Resolve a dependent filter cascade in one call.
+        The options offered for each facet are narrowed by the selections on the facets before it.
+        Selected values that are no longer offered are dropped, as a reset widget would do.
+        Args:
+            selections: facet -> selected value, list of values, or 'All'/None for no filter
+            order: facets in the order they appear in the sidebar
+        Returns:
+            (matching match infos in catalog order,
+             dict facet -> sorted option values,
+             dict facet -> selection that was actually applied)
+        """
+        current = self._all
+        options = {}
+        applied = {}
+        for facet in order:
+            options[facet] = self.values(facet, current)
+            selection = selections.get(facet)
+            if isinstance(selection, (list, tuple, set)):
+                offered = set(options[facet])
+                selection = [value for value in selection if value in offered]
+            elif selection not in options[facet]:
+                selection = None
+            applied[facet] = selection
+            if not _is_unset(selection):
+                current = current & self.rows(facet, selection)
+        return [self.match_infos[row] for row in sorted(current)], options, applied
@@ -0,0 +1,177 @@
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+
+# Minimum trigram similarity (Dice coefficient) for a fuzzy match
+FUZZY_THRESHOLD = 0.5
+
+
+def normalize_name(text):
+    """Case-folded, accent-free, single-spaced form of a name or query, used for every comparison."""
+    text = unicodedata.normalize("NFKD", str(text))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return " ".join(text.casefold().split())
+
+
+def _trigrams(key):
+    """Trigrams of a key padded at both ends, so word starts and short keys still produce grams."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _add_keys(owners, text, name):
+    """Map the full key of text and its forms without leading initials to name; False for an empty key."""
+    key = normalize_name(text)
+    if not key:
+        return False
+    owners[key].add(name)
+    parts = key.split()
+    for i in range(1, len(parts)):
+        owners[" ".join(parts[i:])].add(name)
+    return True
+
+
+class PlayerSearchIndex:
+    """
+    Player-name lookup built once per dataset and queried on every keystroke.
+    Every player is reachable through several search keys: the full name, the name without its leading
+    initials (so 'kohli' finds 'V Kohli' and 'de villiers' finds 'AB de Villiers') and every other spelling
+    recorded under the same Cricsheet registry identifier.
+    Name keys are kept sorted for prefix lookup and indexed by trigram for substring and fuzzy lookup.
+    Registry identifiers are kept apart and only match a query equal to the whole identifier, so parts of
+    an identifier never match a name query.
+    """
+
+    __slots__ = ("_keys", "_owners", "_persons", "_postings", "_gram_counts", "_names")
+
+    def __init__(self, people, aliases=()):
+        """
+        Args:
+            people: iterable of (display name, registry identifier or None)
+            aliases: iterable of (other spelling, display name) that should also find the display name
+        """
+        owners = defaultdict(set)
+        persons = defaultdict(set)
+        spellings = defaultdict(set)
+        for name, person in people:
+            name = str(name)
+            if not _add_keys(owners, name, name):
+                continue
+            if person:
+                persons[normalize_name(person)].add(name)
+                spellings[person].add(name)
+        # Any spelling of a person finds all of their names
+        for names in spellings.values():
+            if len(names) > 1:
+                for spelling in names:
+                    owners[normalize_name(spelling)].update(names)
+        for alias, name in aliases:
+            _add_keys(owners, alias, str(name))
+
+        self._keys = sorted(owners)
+        self._owners = [tuple(sorted(owners[key])) for key in self._keys]
+        self._persons = {person: tuple(sorted(names)) for person, names in persons.items()}
+        self._names = frozenset(name for names in self._owners for name in names)
+        postings = defaultdict(list)
+        gram_counts = []
+        for i, key in enumerate(self._keys):
+            grams = _trigrams(key)
+            gram_counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(i)
+        # Sorted key ids per trigram, so lookups intersect or count them with NumPy
+        self._postings = {gram: np.asarray(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._gram_counts = np.asarray(gram_counts, dtype=np.int32)
+
+    def __len__(self):
+        return len(self._names)
+
+    def _prefix(self, query):
+        """Key ids starting with query, in key order."""
+        ids = []
+        for i in range(bisect_left(self._keys, query), len(self._keys)):
+            if not self._keys[i].startswith(query):
+                break
+            ids.append(i)
+        return ids
+
+    def _substring(self, query):
+        """Key ids containing query (3+ characters), from the intersection of its trigram postings."""
+        grams = {query[i:i + 3] for i in range(len(query) - 2)}
+        if not all(gram in self._postings for gram in grams):
+            return []
+        postings = sorted((self._postings[gram] for gram in grams), key=len)
+        candidates = postings[0]
+        for ids in postings[1:]:
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+        return [i for i in candidates.tolist() if query in self._keys[i]]
+
+    def _fuzzy(self, query):
+        """Key ids whose trigram similarity (Dice) to query reaches FUZZY_THRESHOLD, best first."""
+        grams = _trigrams(query)
+        postings = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not postings:
+            return []
+        shared = np.bincount(np.concatenate(postings), minlength=len(self._keys))
+        ids = np.flatnonzero(shared)
+        scores = 2 * shared[ids] / (len(grams) + self._gram_counts[ids])
+        keep = scores >= FUZZY_THRESHOLD
+        ids, scores = ids[keep], scores[keep]
+        return ids[np.lexsort((ids, -scores))].tolist()
+
+    def search(self, query, within=None, limit=None):
+        """
+        Players matching one query, ranked: whole registry identifier, exact name key, key prefix,
+        substring (3+ characters), then, only when none of those match, fuzzy trigram matches
+        (typos, other transliterations).
+        Args:
+            query: name, part of a name or whole registry identifier (case and accents are ignored)
+            within: optional collection of names the results are restricted to
+            limit: maximum number of results
+        Returns:
+            list of display names
+        """
+        query = normalize_name(query)
+        if not query:
+            return []
+        prefix = self._prefix(query)
+        exact = [i for i in prefix if self._keys[i] == query]
+        ranked = exact + [i for i in prefix if self._keys[i] != query]
+        if len(query) >= 3:
+            seen = set(prefix)
+            ranked += [i for i in self._substring(query) if i not in seen]
+            if not ranked and query not in self._persons:
+                ranked = self._fuzzy(query)
+        within = set(within) if within is not None else None
+        results, seen = [], set()
+        owners = [self._persons.get(query, ())] + [self._owners[i] for i in ranked]
+        for names in owners:
+            for name in names:
+                if (within is None or name in within) and name not in seen:
+                    seen.add(name)
+                    results.append(name)
+                    if limit is not None and len(results) >= limit:
+                        return results
+        return results
+
+    def search_terms(self, text, within=None, limit=None):
+        """Union of search() over the comma-separated terms of text, in term order."""
+        results = {}
+        for term in text.split(","):
+            results.update(dict.fromkeys(self.search(term, within, limit)))
+        return list(results)
+
+
+def build_player_index(store):
+    """
+    PlayerSearchIndex over a delivery store's players table (display names and registry identifiers),
+    with every other spelling in the store's people table as an alias of the player's display name.
+    """
+    players = store["players"][["name", "person"]].astype(str)
+    people = store["people"][["name", "person"]].astype(str).drop_duplicates()
+    aliases = people.merge(players.rename(columns={"name": "player"}), on="person", how="inner")
+    aliases = aliases[aliases["name"] != aliases["player"]]
+    return PlayerSearchIndex(players.itertuples(index=False, name=None),
+                             aliases[["name", "player"]].itertuples(index=False, name=None))
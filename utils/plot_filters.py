@@ -0,0 +1,60 @@
+from functools import lru_cache
+
+import numpy as np
+
+# Comparison operators offered by the plot filters, as element-wise NumPy comparisons
+FILTER_OPERATORS = {
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+    ">": np.greater,
+    "<": np.less,
+    "==": np.equal,
+    "!=": np.not_equal,
+}
+
+
+def filter_key(filters):
+    """Hashable form of a plot-filter list: a tuple of (column, operator, value text) triples."""
+    return tuple((f.get("col") or "", f.get("op") or "", str(f.get("val") or "").strip()) for f in filters)
+
+
+@lru_cache(maxsize=256)
+def compile_filters(key):
+    """
+    Parse a plot-filter list once; repeated reruns with the same filters reuse the result.
+    Values are numbers (a trailing '%' is ignored). A non-numeric value can only be tested with == or !=,
+    against the column's text; incomplete filters and other non-numeric ones are dropped.
+    Args:
+        key: filter_key() of the filter list
+    Returns:
+        tuple of (column, comparison ufunc, value, numeric) in the given order
+    """
+    compiled = []
+    for column, op, text in key:
+        if not column or not text or op not in FILTER_OPERATORS:
+            continue
+        try:
+            compiled.append((column, FILTER_OPERATORS[op], float(text[:-1] if text.endswith("%") else text), True))
+        except ValueError:
+            if op in ("==", "!="):
+                compiled.append((column, FILTER_OPERATORS[op], text, False))
+    return tuple(compiled)
+
+
+def filter_mask(df, filters):
+    """
+    Rows of df passing every filter (AND), as one boolean array built with a comparison per filter.
+    A NaN (undefined) stat only passes '!='. Filters on columns df does not have are ignored.
+    Args:
+        df: table with numeric stat columns
+        filters: list of {'col', 'op', 'val'} dicts as kept in the session state
+    Returns:
+        NumPy bool array of len(df)
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, compare, value, numeric in compile_filters(filter_key(filters)):
+        if column not in df.columns:
+            continue
+        values = df[column].to_numpy() if numeric else df[column].astype(str).to_numpy()
+        mask &= compare(values, value)
+    return mask
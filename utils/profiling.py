@@ -0,0 +1,90 @@
+import io
+import time
+import pstats
+import marshal
+import cProfile
+
+import pandas as pd
+
+from utils.cache import cache_stats
+
+
+class StageProfiler:
+    """
+    Checkpoint timer for a Streamlit rerun: mark() ends the current stage and starts the next one,
+    so a long page script can be split into stages without re-indenting it.
+    Each stage records its duration, an optional row count and the shared cache hits/misses it caused.
+    A disabled profiler does nothing, so the calls can stay in the page permanently.
+    """
+
+    def __init__(self, enabled: bool = False, capture_profile: bool = False):
+        self.enabled = enabled
+        self.stages = []
+        self.finished = False
+        self._current = None
+        self._profile = cProfile.Profile() if enabled and capture_profile else None
+        if self._profile is not None:
+            self._profile.enable()
+
+    def mark(self, name: str, rows: int = None):
+        """End the current stage (if any) and start a new one called name."""
+        if not self.enabled:
+            return
+        self._close()
+        stats = cache_stats()
+        self._current = {"name": name, "rows": rows, "start": time.perf_counter(),
+                         "hits": stats["hits"], "misses": stats["misses"]}
+
+    def rows(self, rows: int):
+        """Set the row count reported for the current stage."""
+        if self.enabled and self._current is not None:
+            self._current["rows"] = rows
+
+    def _close(self):
+        if self._current is None:
+            return
+        stats = cache_stats()
+        stage = self._current
+        self.stages.append({
+            "Stage": stage["name"],
+            "Seconds": time.perf_counter() - stage["start"],
+            "Rows": stage["rows"],
+            "Cache Hits": stats["hits"] - stage["hits"],
+            "Cache Misses": stats["misses"] - stage["misses"],
+        })
+        self._current = None
+
+    def finish(self):
+        """End the current stage and stop the cProfile capture; later calls do nothing."""
+        if not self.enabled or self.finished:
+            return
+        self._close()
+        if self._profile is not None:
+            self._profile.disable()
+        self.finished = True
+
+    def to_frame(self):
+        """Stage table with Stage, Seconds, Rows, Cache Hits, Cache Misses and share of the total time."""
+        df = pd.DataFrame(self.stages, columns=["Stage", "Seconds", "Rows", "Cache Hits", "Cache Misses"])
+        total = df["Seconds"].sum()
+        df["%"] = df["Seconds"] / total * 100 if total > 0 else 0.0
+        return df
+
+    @property
+    def has_profile(self):
+        return self._profile is not None
+
+    def profile_text(self, limit: int = 40):
+        """Top functions of the captured profile by cumulative time, as pstats text."""
+        if self._profile is None:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self._profile, stream=out).sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def profile_bytes(self):
+        """The captured profile in the binary .prof format read by pstats, snakeviz and similar tools."""
+        if self._profile is None:
+            return b""
+        self._profile.create_stats()
+        return marshal.dumps(self._profile.stats)
@@ -1,78 +1,80 @@
+import numpy as np
 import pandas as pd
-from collections import defaultdict
+from utils.accumulator import BattingAccumulator, BATTING_COUNTERS
+from utils.delivery_store import flatten_match, frames_from_tables, player_names
 
 
 def compute_basic_stats(dataset, team_filter=None, player_filter=None):
     """
     Convert JSON dataset to DataFrame and compute basic stats.
     Processes innings data and computes batting/bowling stats.
+    Players are keyed by integer ids from the match's registry (info.registry.people), and each
+    innings' figures are summed per id with np.bincount.
     """
     # Extract match info
     info = dataset.get('info', {})
     innings_data = dataset.get('innings', [])
 
+    # Dense ids in registry order; names missing from the registry get the next free ids
+    player_ids = {name: i for i, name in enumerate(info.get('registry', {}).get('people', {}))}
+
     # Process innings data
     innings_stats = []
 
     for inning in innings_data:
         team = inning.get('team', '')
-        overs = inning.get('overs', [])
-
-        # Initialize stats for this innings
-        batters_stats = {}
-        bowlers_stats = {}
+        batters, bowlers, bat_runs, total_runs, wickets = [], [], [], [], []
 
         # Process each over
-        for over in overs:
+        for over in inning.get('overs', []):
             for delivery in over.get('deliveries', []):
-                batter = delivery.get('batter', '')
-                bowler = delivery.get('bowler', '')
                 runs = delivery.get('runs', {})
-                batter_runs = runs.get('batter', 0)
-                extras = runs.get('extras', 0)
-                total = runs.get('total', 0)
-
-                # Update batter stats
-                if batter not in batters_stats:
-                    batters_stats[batter] = {'runs': 0, 'balls': 0, 'fours': 0, 'sixes': 0}
-                batters_stats[batter]['runs'] += batter_runs
-                batters_stats[batter]['balls'] += 1
-                if batter_runs == 4:
-                    batters_stats[batter]['fours'] += 1
-                elif batter_runs == 6:
-                    batters_stats[batter]['sixes'] += 1
-
-                # Update bowler stats
-                if bowler not in bowlers_stats:
-                    bowlers_stats[bowler] = {'runs': 0, 'balls': 0, 'wickets': 0}
-                bowlers_stats[bowler]['runs'] += total
-                bowlers_stats[bowler]['balls'] += 1
-                if 'wickets' in delivery:
-                    bowlers_stats[bowler]['wickets'] += len(delivery['wickets'])
-
-        # Convert stats to DataFrame records
-        for batter, stats in batters_stats.items():
+                batters.append(player_ids.setdefault(delivery.get('batter', ''), len(player_ids)))
+                bowlers.append(player_ids.setdefault(delivery.get('bowler', ''), len(player_ids)))
+                bat_runs.append(runs.get('batter', 0))
+                total_runs.append(runs.get('total', 0))
+                wickets.append(len(delivery.get('wickets', [])))
+        if not batters:
+            continue
+
+        names = list(player_ids)
+        batters = np.asarray(batters)
+        bowlers = np.asarray(bowlers)
+        bat_runs = np.asarray(bat_runs, dtype=np.int64)
+
+        def _sum(ids, weights=None):
+            return np.bincount(ids, weights=weights, minlength=len(names)).astype(np.int64)
+
+        def _first_seen(ids):
+            unique, first = np.unique(ids, return_index=True)
+            return unique[np.argsort(first)]
+
+        # Convert stats to DataFrame records, batters then bowlers in order of appearance
+        runs, balls = _sum(batters, bat_runs), _sum(batters)
+        fours, sixes = _sum(batters, bat_runs == 4), _sum(batters, bat_runs == 6)
+        for i in _first_seen(batters):
             innings_stats.append({
                 'team': team,
-                'player': batter,
+                'player': names[i],
                 'role': 'batter',
-                'runs': stats['runs'],
-                'balls': stats['balls'],
-                'fours': stats['fours'],
-                'sixes': stats['sixes'],
-                'strike_rate': (stats['runs'] / stats['balls'] * 100) if stats['balls'] > 0 else 0
+                'runs': int(runs[i]),
+                'balls': int(balls[i]),
+                'fours': int(fours[i]),
+                'sixes': int(sixes[i]),
+                'strike_rate': (runs[i] / balls[i] * 100) if balls[i] > 0 else 0
             })
 
-        for bowler, stats in bowlers_stats.items():
-            overs = stats['balls'] // 6 + (stats['balls'] % 6) / 10
+        runs, balls, wkts = _sum(bowlers, total_runs), _sum(bowlers), _sum(bowlers, wickets)
+        for i in _first_seen(bowlers):
+            overs = int(balls[i]) // 6 + (int(balls[i]) % 6) / 10
             innings_stats.append({
                 'team': team,
-                'player': bowler,
+                'player': names[i],
                 'role': 'bowler',
                 'overs': overs,
-                'runs': stats['runs'],
-                'wickets': stats['wickets'],
-                'economy': stats['runs'] / overs if overs > 0 else 0
+                'runs': int(runs[i]),
+                'wickets': int(wkts[i]),
+                'economy': int(runs[i]) / overs if overs > 0 else 0
             })
 
     # Create DataFrame
@@ -106,73 +108,128 @@ def compute_match_level_true_batting_stats(dataset):
     for team, players in match_info.get('players', {}).items():
         team_players[team] = players[:6]  # Top 6 batters
 
-    # Track stats for each player in this match
-    player_stats = defaultdict(lambda: {
-        'runs': 0, 'balls': 0, 'outs': 0, 'team': ''
-    })
+    # Runs, deliveries faced and dismissals on strike per player, in one counter matrix
+    counters = BattingAccumulator()
+    player_team = {}
 
     # Process each innings
     for inning in innings_data:
         team = inning.get('team', '')
-
-        # Process deliveries to collect stats
         for over in inning.get('overs', []):
             for delivery in over.get('deliveries', []):
                 batter = delivery.get('batter', '')
-                runs = delivery.get('runs', {}).get('batter', 0)
-
-                player_stats[batter]['runs'] += runs
-                player_stats[batter]['balls'] += 1
-                player_stats[batter]['team'] = team
-
-                # Check for wickets
-                if 'wickets' in delivery:
-                    for wicket in delivery['wickets']:
-                        if wicket.get('player_out') == batter:
-                            player_stats[batter]['outs'] += 1
-
-    # Calculate top 6 aggregate stats for each team
-    team_top6_stats = {}
-    for team, top6_players in team_players.items():
-        total_runs = sum(player_stats[p]['runs'] for p in top6_players if p in player_stats)
-        total_balls = sum(player_stats[p]['balls'] for p in top6_players if p in player_stats)
-        total_outs = sum(player_stats[p]['outs'] for p in top6_players if p in player_stats)
-
-        team_top6_stats[team] = {
-            'avg': total_runs / total_outs if total_outs > 0 else 0,
-            'sr': (total_runs / total_balls * 100) if total_balls > 0 else 0
-        }
+                counters.add_delivery(batter, delivery.get('runs', {}).get('batter', 0))
+                player_team[batter] = team
+                for wicket in delivery.get('wickets', ()):
+                    if wicket.get('player_out') == batter:
+                        counters.add_dismissal(batter)
+
+    if not len(counters):
+        return pd.DataFrame()
+    players = counters.players
+    totals = counters.totals()
+    runs = totals[:, BATTING_COUNTERS.index('runs')]
+    balls = totals[:, BATTING_COUNTERS.index('deliveries')]
+    outs = totals[:, BATTING_COUNTERS.index('dismissed')]
+    teams = [player_team[player] for player in players]
+    is_top6 = np.array([player in team_players.get(team, []) for player, team in zip(players, teams)], dtype=bool)
+
+    # Team top 6 aggregates, as the baseline of every player in that team
+    top6 = {}
+    for i in np.flatnonzero(is_top6):
+        top6[teams[i]] = top6.get(teams[i], 0) + np.array([runs[i], balls[i], outs[i]])
+    baseline = np.array([top6.get(team, np.zeros(3, dtype=np.int64)) for team in teams]).reshape(-1, 3)
+
+    average, strike_rate, true_average, true_strike_rate = _true_stats_from_sums(
+        runs, balls, outs, baseline[:, 0], baseline[:, 1], baseline[:, 2])
+    return pd.DataFrame({
+        'player': players,
+        'team': teams,
+        'runs': runs,
+        'balls': balls,
+        'outs': outs,
+        'average': average,
+        'strike_rate': strike_rate,
+        'true_average': true_average,
+        'true_strike_rate': true_strike_rate,
+        'is_top6': is_top6,
+    })
 
-    # Calculate true stats for each player
-    results = []
-    for player, stats in player_stats.items():
-        if stats['balls'] > 0:  # Only include players who faced balls
-            team = stats['team']
-            player_avg = stats['runs'] / stats['outs'] if stats['outs'] > 0 else stats['runs']  # If not out, use runs
-            player_sr = (stats['runs'] / stats['balls']) * 100
 
-            # Get team's top 6 benchmarks
-            top6_avg = team_top6_stats.get(team, {}).get('avg', 0)
-            top6_sr = team_top6_stats.get(team, {}).get('sr', 0)
+def compute_match_true_batting(store, match_ids=None):
+    """
+    True average and true strike rate of every batter in every match, in one grouped pass over the deliveries.
+    Each batter is compared with the combined runs/balls/outs of their team's top 6 (first six in the
+    playing XI) in the same match. Balls are all deliveries faced and outs are dismissals on strike;
+    a not-out batter's average is their runs.
 
-            # Calculate true stats
-            true_avg = ((player_avg / top6_avg) - 1) * 100 if top6_avg > 0 else 0
-            true_sr = ((player_sr / top6_sr) - 1) * 100 if top6_sr > 0 else 0
+    Args:
+        store: dict of DataFrames from utils.delivery_store.load_delivery_store (or frames_from_tables)
+        match_ids: match ids to include (all matches when None)
+    Returns:
+        DataFrame with one row per (match_id, team, batter_id); 'batter' is the player's display name
+    """
+    deliveries = store['deliveries']
+    wickets = store['wickets']
+    squads = store['squads']
+    if match_ids is not None:
+        match_ids = list(match_ids)
+        deliveries = deliveries[deliveries['match_id'].isin(match_ids)]
+        wickets = wickets[wickets['match_id'].isin(match_ids)]
+        squads = squads[squads['match_id'].isin(match_ids)]
+    key = ['match_id', 'team', 'batter_id']
+
+    batting = (deliveries.groupby(key, observed=True, sort=False)
+               .agg(runs=('batter_runs', 'sum'), balls=('batter_runs', 'size'))
+               .reset_index().astype({'match_id': str, 'team': str}))
+    on_strike = wickets['player_out_id'].to_numpy() == wickets['batter_id'].to_numpy()
+    outs = (wickets[on_strike].groupby(key, observed=True, sort=False).size()
+            .rename('outs').reset_index().astype({'match_id': str, 'team': str}))
+    top6 = (squads[squads['order'].to_numpy() < 6][['match_id', 'team', 'player_id']]
+            .astype({'match_id': str, 'team': str}).rename(columns={'player_id': 'batter_id'}).drop_duplicates())
+
+    per = batting.merge(outs, on=key, how='left').merge(top6.assign(is_top6=True), on=key, how='left')
+    per.insert(2, 'batter', player_names(store, per['batter_id']))
+    per['outs'] = per['outs'].fillna(0).astype(np.int64)
+    per['is_top6'] = per['is_top6'].fillna(False).astype(bool)
+
+    baseline = (per[per['is_top6']].groupby(['match_id', 'team'])[['runs', 'balls', 'outs']].sum()
+                .add_prefix('top6_').reset_index())
+    per = per.merge(baseline, on=['match_id', 'team'], how='left')
+    for c in ('top6_runs', 'top6_balls', 'top6_outs'):
+        per[c] = per[c].fillna(0).astype(np.int64)
+
+    (per['average'], per['strike_rate'],
+     per['true_average'], per['true_strike_rate']) = _true_stats_from_sums(*(per[c].to_numpy() for c in FORM_SUMS))
+    return per
+
+
+def _summarize_true_batting(per_match, top_n):
+    """Average the per-match true stats per batter and keep the top_n run scorers."""
+    if per_match.empty:
+        return pd.DataFrame(columns=['batter', 'true_avg', 'true_sr', 'matches_played', 'runs', 'balls', 'outs'])
+    df = (per_match.groupby('batter_id')
+          .agg(batter=('batter', 'first'), true_avg=('true_average', 'mean'), true_sr=('true_strike_rate', 'mean'),
+               matches_played=('match_id', 'nunique'), runs=('runs', 'sum'), balls=('balls', 'sum'),
+               outs=('outs', 'sum'))
+          .reset_index(drop=True))
+    df = df.sort_values(by=['runs', 'batter'], ascending=[False, True], kind='stable').head(top_n)
+    return df
 
-            results.append({
-                'player': player,
-                'team': team,
-                'runs': stats['runs'],
-                'balls': stats['balls'],
-                'outs': stats['outs'],
-                'average': player_avg,
-                'strike_rate': player_sr,
-                'true_average': true_avg,
-                'true_strike_rate': true_sr,
-                'is_top6': player in team_players.get(team, [])
-            })
 
-    return pd.DataFrame(results)
+def compute_true_batting_stats_from_store(store, match_ids=None, top_n=25):
+    """
+    Career true stats over the selected matches of the delivery store: each batter's per-match
+    true average and true strike rate (see compute_match_true_batting), averaged over their matches.
+
+    Args:
+        store: dict of DataFrames from utils.delivery_store.load_delivery_store
+        match_ids: match ids to include (all matches when None)
+        top_n: number of top run scorers to return
+    Returns:
+        DataFrame with batter, true_avg, true_sr, matches_played, runs, balls and outs
+    """
+    return _summarize_true_batting(compute_match_true_batting(store, match_ids), top_n)
 
 
 def compute_true_batting_stats(match_data_list, top_n=25):
@@ -187,89 +244,452 @@ def compute_true_batting_stats(match_data_list, top_n=25):
     Returns:
         DataFrame with batter stats including true_avg and true_sr
     """
-    from collections import defaultdict
-
-    # Track stats for each batter across all matches
-    bat_stats = defaultdict(lambda: {
-        "runs": 0,          # Total runs
-        "balls": 0,         # Total balls
-        "outs": 0,         # Total dismissals
-        "matches": 0,       # Number of matches
-        "true_avg_sum": 0,  # Sum of true averages (for calculating mean)
-        "true_sr_sum": 0,   # Sum of true strike rates (for calculating mean)
-        "position_sum": 0,  # Sum of batting positions (for calculating mean)
-    })
+    tables = None
+    for i, match in enumerate(match_data_list):
+        tables = flatten_match(match, str(i), tables)
+    if tables is None:
+        return _summarize_true_batting(pd.DataFrame(), top_n)
+    return _summarize_true_batting(compute_match_true_batting(frames_from_tables(tables)), top_n)
 
-    for match in match_data_list:
-        # Get top 6 batters for each team (assume first 6 in players list)
-        innings = match.get("innings", [])
-        top6_stats = []
-        for inn in innings:
-            team = inn.get("team")
-            players = match["info"]["players"].get(team, [])[:6]
-            # Collect runs and outs for top 6
-            runs = defaultdict(int)
-            balls = defaultdict(int)
-            outs = defaultdict(int)
-            for over in inn.get("overs", []):
-                for delivery in over.get("deliveries", []):
-                    batter = delivery.get("batter")
-                    runs[batter] += delivery["runs"]["batter"]
-                    balls[batter] += 1
-                    if "wickets" in delivery:
-                        for w in delivery["wickets"]:
-                            if w.get("player_out") == batter:
-                                outs[batter] += 1
-            # Only consider top 6
-            top6_runs = sum(runs[p] for p in players)
-            top6_outs = sum(outs[p] for p in players)
-            top6_balls = sum(balls[p] for p in players)
-            top6_stats.append({"runs": top6_runs, "outs": top6_outs, "balls": top6_balls, "players": players})
-
-        # For each batter in match, calculate true stats
-        for inn, top6 in zip(innings, top6_stats):
-            for over in inn.get("overs", []):
-                for delivery in over.get("deliveries", []):
-                    batter = delivery.get("batter")
-                    bat_stats[batter]["runs"] += delivery["runs"]["batter"]
-                    bat_stats[batter]["balls"] += 1
-                    if "wickets" in delivery:
-                        for w in delivery["wickets"]:
-                            if w.get("player_out") == batter:
-                                bat_stats[batter]["outs"] += 1
-                    # True stats for this match
-                    # True average: (batter_avg / top6_avg - 1) * 100
-                    # True strike rate: (batter_sr / top6_sr - 1) * 100
-            # Compute batter's match stats
-            for p in top6["players"]:
-                runs = bat_stats[p]["runs"]
-                balls = bat_stats[p]["balls"]
-                outs = bat_stats[p]["outs"]
-                # Avoid div by zero
-                batter_avg = runs / outs if outs else 0
-                top6_avg = top6["runs"] / top6["outs"] if top6["outs"] else 0
-                batter_sr = (runs / balls) * 100 if balls else 0
-                top6_sr = (top6["runs"] / top6["balls"] * 100) if top6["balls"] else 0
-                true_avg = ((batter_avg / top6_avg) - 1) * 100 if top6_avg else 0
-                true_sr = ((batter_sr / top6_sr) - 1) * 100 if top6_sr else 0
-                bat_stats[p]["true_avg_sum"] += true_avg
-                bat_stats[p]["true_sr_sum"] += true_sr
-                bat_stats[p]["matches"] += 1
-
-    # Prepare DataFrame
-    rows = []
-    for batter, stats in bat_stats.items():
-        matches = stats["matches"]
-        if matches > 0:
-            rows.append({
-                "batter": batter,
-                "true_avg": stats["true_avg_sum"] / matches,
-                "true_sr": stats["true_sr_sum"] / matches,
-                "matches_played": matches,
-                "runs": stats["runs"],
-                "balls": stats["balls"],
-                "outs": stats["outs"]
-            })
-    df = pd.DataFrame(rows)
-    df = df.sort_values(by="runs", ascending=False).head(top_n)
-    return df
\ No newline at end of file
+
+# Per-match counts that the rolling form keeps running totals of
+FORM_SUMS = ['runs', 'balls', 'outs', 'top6_runs', 'top6_balls', 'top6_outs']
+
+
+def compute_true_batting_form(store, match_dates, match_ids=None, players=None):
+    """
+    Date-ordered prefix sums of each batter's runs, balls and outs and of their team's top-6 baseline.
+    The sum over any run of consecutive matches is the difference of two rows, so a window of
+    any length (see true_batting_window / rolling_true_batting) costs O(1) per point.
+
+    Args:
+        store: dict of DataFrames from utils.delivery_store.load_delivery_store
+        match_dates: dict match_id -> 'YYYY-MM-DD' date used to order each batter's matches
+        match_ids: match ids to include (all matches when None)
+        players: display names of the batters to keep (everyone when None)
+    Returns:
+        DataFrame with one row per (batter, match) in date order: batter, batter_id, match_id, team, date,
+        match_no (1-based per batter), the per-match counts and cum_* running totals of FORM_SUMS
+    """
+    per = compute_match_true_batting(store, match_ids)
+    if players is not None:
+        per = per[per['batter'].isin(list(players))]
+    per = per[['batter', 'batter_id', 'match_id', 'team'] + FORM_SUMS].copy()
+    per['date'] = per['match_id'].map(match_dates).fillna('')
+    # A batter can only appear for one team in a match, so (batter, date, match_id) is a total order
+    per = per.sort_values(['batter', 'date', 'match_id'], kind='stable').reset_index(drop=True)
+    by_batter = per.groupby('batter_id', sort=False)
+    per['match_no'] = by_batter.cumcount() + 1
+    cums = by_batter[FORM_SUMS].cumsum()
+    for c in FORM_SUMS:
+        per[f'cum_{c}'] = cums[c].to_numpy()
+    return per
+
+
+def _true_stats_from_sums(runs, balls, outs, top6_runs, top6_balls, top6_outs):
+    """True average and true strike rate of summed counts, with the same conventions as the per-match stats."""
+    runs = np.asarray(runs, dtype=float)
+    outs = np.asarray(outs, dtype=float)
+    average = np.where(outs > 0, _ratio(runs, outs), runs)
+    strike_rate = _ratio(runs, balls, 100, 0.0)
+    top6_avg = _ratio(top6_runs, top6_outs, 1, 0.0)
+    top6_sr = _ratio(top6_runs, top6_balls, 100, 0.0)
+    true_average = np.where(top6_avg > 0, (_ratio(average, top6_avg, 1, 1.0) - 1) * 100, 0.0)
+    true_strike_rate = np.where(top6_sr > 0, (_ratio(strike_rate, top6_sr, 1, 1.0) - 1) * 100, 0.0)
+    return average, strike_rate, true_average, true_strike_rate
+
+
+def rolling_true_batting(form, window=10):
+    """
+    True average and true strike rate over the last `window` matches, at every match of every batter.
+    Window totals are the running total minus the running total `window` matches earlier; the first
+    window - 1 matches of a career use every match so far.
+
+    Args:
+        form: DataFrame from compute_true_batting_form
+        window: number of matches per window (the whole career so far when None or 0)
+    Returns:
+        form with window_* totals, window_matches, average, strike_rate, true_average and true_strike_rate added
+    """
+    df = form.copy()
+    cum_cols = [f'cum_{c}' for c in FORM_SUMS]
+    if window:
+        earlier = df.groupby('batter_id', sort=False)[cum_cols].shift(window).fillna(0).to_numpy()
+    else:
+        earlier = np.zeros((len(df), len(cum_cols)))
+    totals = df[cum_cols].to_numpy() - earlier
+    for i, c in enumerate(FORM_SUMS):
+        df[f'window_{c}'] = totals[:, i].astype(np.int64)
+    df['window_matches'] = np.minimum(df['match_no'], window) if window else df['match_no']
+    (df['average'], df['strike_rate'],
+     df['true_average'], df['true_strike_rate']) = _true_stats_from_sums(*totals.T)
+    return df
+
+
+def true_batting_window(form, player, window=10, end=None):
+    """
+    True stats of one batter over `window` matches ending at their `end`-th match (the latest when None).
+
+    Args:
+        form: DataFrame from compute_true_batting_form
+        player: batter name
+        window: number of matches in the window (the whole career up to `end` when None or 0)
+        end: 1-based match number the window ends at
+    Returns:
+        dict with matches, runs, balls, outs, average, strike_rate, true_average and true_strike_rate
+        (None when the batter has no matches)
+    """
+    rows = form[form['batter'] == player]
+    if rows.empty:
+        return None
+    end = len(rows) if end is None else max(1, min(int(end), len(rows)))
+    start = max(0, end - window) if window else 0
+    cum_cols = [f'cum_{c}' for c in FORM_SUMS]
+    totals = rows[cum_cols].to_numpy()[end - 1].astype(float)
+    if start > 0:
+        totals = totals - rows[cum_cols].to_numpy()[start - 1]
+    average, strike_rate, true_average, true_strike_rate = (float(v[()]) for v in _true_stats_from_sums(*totals))
+    return {
+        'matches': end - start,
+        'runs': int(totals[0]), 'balls': int(totals[1]), 'outs': int(totals[2]),
+        'average': average, 'strike_rate': strike_rate,
+        'true_average': true_average, 'true_strike_rate': true_strike_rate,
+    }
+
+
+# Batting positions are the number of wickets already fallen when the batter faced their first legal ball
+BATTING_POSITIONS = range(0, 10)
+POSITION_STATS = ['Runs', 'Balls', 'SR', 'Average', 'BpB', '4s', '6s', '30s', '50s', '100s']
+
+# Match phases as (column prefix, first over, last over) with 0-based, inclusive over numbers.
+# 'DO' (death overs) keeps the column names the Batting Stats page has always used.
+DEFAULT_PHASES = [('PP', 0, 5), ('MID', 6, 14), ('DO', 15, 19)]
+PHASE_STATS = ['Runs', 'Balls', '4s', '6s', '%', 'Dots', 'Dot_%', 'SR', 'Dismissals', 'Average', 'BpB']
+
+
+def _ratio(num, den, scale=1.0, undefined=np.nan):
+    """Element-wise num / den * scale, with `undefined` wherever den is 0."""
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    out = np.full(num.shape, undefined, dtype=float)
+    np.divide(num * scale, den, out=out, where=den > 0)
+    return out
+
+
+def _phase_index(overs, phases):
+    """Index into phases for each (0-based) over number, -1 for overs outside every phase (and negative overs)."""
+    overs = np.asarray(overs, dtype=np.int64)
+    lookup = np.full(max(last for _, _, last in phases) + 2, -1, dtype=np.int64)
+    for i, (_, first, last) in enumerate(phases):
+        lookup[first:last + 1] = i
+    return np.where(overs < 0, -1, lookup[np.clip(overs, 0, len(lookup) - 1)])
+
+
+def compute_phase_stats(store, match_ids=None, phases=None, players=None):
+    """
+    Per-phase batting stats for every phase, by summing the batting cube's per-over rows into phases.
+    Super-over deliveries belong to no phase.
+
+    Args:
+        store: dict of DataFrames from utils.delivery_store.load_delivery_store
+        match_ids: match ids to include (all matches when None)
+        phases: list of (column prefix, first over, last over); DEFAULT_PHASES when None
+        players: integer player ids to return (everyone who faced a delivery or was out in a phase when None)
+    Returns:
+        DataFrame indexed by player name with {prefix}_Runs, _Balls, _4s, _6s, _Dots, _Dismissals,
+        _Dot_%, _SR, _Average and _BpB for each phase ({prefix}_% needs career runs and is left to the caller)
+    """
+    phases = DEFAULT_PHASES if phases is None else phases
+    cube = store['batting_cube']
+    if match_ids is not None:
+        cube = cube[cube['match_id'].isin(list(match_ids))]
+
+    # Each (player, phase) pair is one bin: bin = player id * number of phases + phase
+    n_players = len(store['players'])
+    n_bins = n_players * len(phases)
+    phase = _phase_index(cube['over'], phases)
+    keep = (cube['batter_id'].to_numpy() >= 0) & (phase >= 0)
+    bins = cube['batter_id'].to_numpy().astype(np.int64)[keep] * len(phases) + phase[keep]
+    counts = {c: np.bincount(bins, weights=cube[c].to_numpy()[keep], minlength=n_bins)
+              .astype(np.int64).reshape(n_players, len(phases))
+              for c in ['runs', 'balls', 'fours', 'sixes', 'dots', 'dismissed']}
+
+    if players is None:
+        rows = np.flatnonzero((counts['runs'] + counts['balls'] + counts['dismissed']).sum(axis=1) > 0)
+    else:
+        rows = np.asarray(players, dtype=np.int64)
+    counts = {name: c[rows] for name, c in counts.items()}
+    players = pd.Index(player_names(store, rows), name='Player')
+
+    out = {}
+    for i, (prefix, _, _) in enumerate(phases):
+        runs, balls, fours, sixes, dots, dismissed = [
+            counts[c][:, i] for c in ['runs', 'balls', 'fours', 'sixes', 'dots', 'dismissed']]
+        out[f'{prefix}_Runs'] = runs
+        out[f'{prefix}_Balls'] = balls
+        out[f'{prefix}_4s'] = fours
+        out[f'{prefix}_6s'] = sixes
+        out[f'{prefix}_Dots'] = dots
+        out[f'{prefix}_Dot_%'] = _ratio(dots, balls, 100, 0.0)
+        out[f'{prefix}_SR'] = _ratio(runs, balls, 100, 0.0)
+        out[f'{prefix}_Dismissals'] = dismissed
+        out[f'{prefix}_Average'] = _ratio(runs, dismissed)
+        out[f'{prefix}_BpB'] = np.where(balls > 0, _ratio(balls, fours + sixes), np.nan)
+    out = pd.DataFrame(out, index=players)
+    out.index.name = 'Player'
+    return out
+
+
+def _position_block(runs, balls, fours, sixes, dismissals, innings_, m30, m50, m100, prefix):
+    """Per-position stat columns (POSITION_STATS, then Innings and Dismissals) from summed counters."""
+    boundaries = fours + sixes
+    return {
+        f'{prefix}Runs': runs,
+        f'{prefix}Balls': balls,
+        f'{prefix}SR': _ratio(runs, balls, 100, 0.0),
+        f'{prefix}Average': _ratio(runs, dismissals),
+        f'{prefix}BpB': np.where(balls > 0, _ratio(balls, boundaries), np.nan),
+        f'{prefix}4s': fours,
+        f'{prefix}6s': sixes,
+        f'{prefix}30s': m30,
+        f'{prefix}50s': m50,
+        f'{prefix}100s': m100,
+        f'{prefix}Innings': innings_,
+        f'{prefix}Dismissals': dismissals,
+    }
+
+
+_POSITION_COUNTERS = ['pos_runs', 'balls', 'pos_fours', 'pos_sixes', 'dismissals', 'innings', '30s', '50s', '100s']
+
+
+def _position_columns(pos, players):
+    """
+    The {p}_* columns for every batting position, built in long format and pivoted once.
+    Args:
+        pos: long frame of summed counters indexed by (batter_id, position)
+        players: player ids, the index of the result
+    Returns:
+        DataFrame indexed by player id with {p}_Runs ... {p}_Dismissals, position by position
+    """
+    grid = pd.MultiIndex.from_product([players, BATTING_POSITIONS], names=['batter_id', 'position'])
+    counts = pos.reindex(grid, fill_value=0)
+    long = pd.DataFrame(_position_block(*(counts[c].to_numpy() for c in _POSITION_COUNTERS), prefix=''), index=grid)
+    wide = long.unstack('position')
+    wide.columns = [f'{p}_{stat}' for stat, p in wide.columns]
+    return wide.reindex(index=players, columns=[f'{p}_{stat}' for p in BATTING_POSITIONS for stat in long.columns])
+
+
+def compute_batting_stats(store, match_ids=None, selected_positions=None, phases=None):
+    """
+    Compute the Batting Stats table by summing rows of the batting cube for the selected matches;
+    the per-position columns sum the per-innings scorecard (batting_innings), one row per innings.
+    Counters are int64 and ratios float64; ratios that are undefined (no dismissals, no boundaries) are NaN.
+    Values are unrounded, with no '%' or '-' strings: display formatting belongs to the renderer.
+
+    Args:
+        store: dict of DataFrames from utils.delivery_store.load_delivery_store
+        match_ids: match ids to include (all matches when None)
+        selected_positions: batting positions aggregated into the SelPos_* columns (0..9 when empty)
+        phases: match phases for the per-phase columns; DEFAULT_PHASES (PP_*, MID_*, DO_*) when None
+    Returns:
+        DataFrame indexed by player with career, per-phase, {p}_* per-position and SelPos_* columns
+    """
+    phases = DEFAULT_PHASES if phases is None else phases
+    cube = store['batting_cube']
+    innings = store['batting_innings']
+    squads = store['squads']
+    if match_ids is not None:
+        match_ids = list(match_ids)
+        cube = cube[cube['match_id'].isin(match_ids)]
+        innings = innings[innings['match_id'].isin(match_ids)]
+        squads = squads[squads['match_id'].isin(match_ids)]
+
+    # Everything below is a sum over cube rows, grouped by player id; ratios are derived from the sums
+    counters = ['deliveries', 'runs', 'balls', 'fours', 'sixes', 'dots', 'dismissed', 'innings', '30s', '50s', '100s']
+    career = cube.groupby('batter_id')[counters].sum().astype(np.int64)
+    # Players are those who faced at least one delivery; dismissal-only rows still count for them
+    career = career[career['deliveries'] > 0]
+    # Rows in display-name order
+    career = career.iloc[np.argsort(player_names(store, career.index).astype(str), kind='stable')]
+    players = career.index
+    # Matches are playing XIs: distinct (match, player id) pairs, counted per player (-1: unnamed)
+    n_players = len(store['players'])
+    squad_ids = squads['player_id'].to_numpy().astype(np.int64)
+    named = squad_ids >= 0
+    squad_keys = np.unique(squads['match_id'].cat.codes.to_numpy().astype(np.int64)[named] * n_players
+                           + squad_ids[named])
+    matches = pd.Series(np.bincount(squad_keys % n_players, minlength=n_players))
+
+    out = {}
+    out['Matches'] = matches.reindex(players, fill_value=0)
+    out['Innings'] = career['innings']
+    out['Runs'] = career['runs']
+    out['Balls'] = career['balls']
+    out['4s'] = career['fours']
+    out['6s'] = career['sixes']
+    out['BpB'] = _ratio(career['balls'], career['fours'] + career['sixes'])
+    out['SR'] = _ratio(career['runs'], career['balls'], 100, 0.0)
+    out['Dismissals'] = career['dismissed']
+    out['Not Outs'] = out['Innings'].to_numpy() - out['Dismissals'].to_numpy()
+    out['Average'] = _ratio(out['Runs'], out['Dismissals'])
+    out['Dots'] = career['dots']
+    out['Dot_%'] = _ratio(career['dots'], career['balls'], 100, 0.0)
+
+    # Every phase gets the same column family from one grouped pass
+    phase_stats = compute_phase_stats(store, match_ids, phases, players)
+    for prefix, _, _ in phases:
+        phase_stats[f'{prefix}_%'] = _ratio(phase_stats[f'{prefix}_Runs'], career['runs'], 100, 0.0)
+        for stat in PHASE_STATS:
+            out[f'{prefix}_{stat}'] = phase_stats[f'{prefix}_{stat}'].to_numpy()
+    out['30s'] = career['30s']
+    out['50s'] = career['50s']
+    out['100s'] = career['100s']
+
+    # Per-position counters, as a long (player, position) frame summed over the innings that reached a legal ball
+    started = innings[innings['entry'].to_numpy() >= 0]
+    legal_runs = started['legal_runs'].to_numpy()
+    pos = pd.DataFrame({
+        'batter_id': started['batter_id'].to_numpy(),
+        'position': started['entry'].to_numpy(),
+        'pos_runs': started['pos_runs'].to_numpy(),
+        'balls': started['balls'].to_numpy(),
+        'pos_fours': started['pos_fours'].to_numpy(),
+        'pos_sixes': started['pos_sixes'].to_numpy(),
+        'dismissals': started['pos_dismissed'].to_numpy(),
+        'innings': 1,
+        **{f'{m}s': legal_runs >= m for m in (30, 50, 100)},
+    }).astype(np.int64).groupby(['batter_id', 'position']).sum()
+
+    try:
+        sel = [int(p) for p in selected_positions] if selected_positions else None
+    except (TypeError, ValueError):
+        sel = None
+    sel_keys = list(BATTING_POSITIONS) if not sel else sel
+    sel_pos = pos[pos.index.get_level_values('position').isin(sel_keys)].groupby(level='batter_id').sum()
+    sel_pos = sel_pos.reindex(players, fill_value=0)
+    block = _position_block(*(sel_pos[c].to_numpy() for c in _POSITION_COUNTERS), prefix='SelPos_')
+
+    out = pd.concat([
+        pd.DataFrame({name: np.asarray(values) for name, values in out.items()}, index=players),
+        _position_columns(pos, players),
+        pd.DataFrame(block, index=players),
+    ], axis=1)
+    out.index = pd.Index(player_names(store, players), name='Player')
+    return out
+
+
+# Dismissal kinds credited to the bowler; run outs, retirements and obstructing the field are not
+BOWLER_WICKET_KINDS = ['bowled', 'caught', 'caught and bowled', 'lbw', 'stumped', 'hit wicket']
+BOWLING_PHASE_STATS = ['Overs', 'Balls', 'Runs', 'Wickets', 'Economy', 'Average', 'SR', 'Dots', 'Dot_%', '4s', '6s']
+
+
+def _overs(balls):
+    """Legal balls in cricket overs notation (e.g. 23 balls -> 3.5)."""
+    balls = np.asarray(balls, dtype=np.int64)
+    return balls // 6 + (balls % 6) / 10
+
+
+def compute_bowling_stats(store, match_ids=None, phases=None):
+    """
+    Compute the Bowling Stats table in one grouped pass over the deliveries and wickets.
+    Legal balls exclude wides and no-balls; runs conceded are runs off the bat plus wides and no-balls
+    (byes and leg byes are not charged to the bowler). Only BOWLER_WICKET_KINDS count as bowler wickets.
+    Super overs are left out, as in official bowling figures.
+    Ratios that are undefined (no balls, no wickets) are NaN.
+
+    Args:
+        store: dict of DataFrames from utils.delivery_store.load_delivery_store
+        match_ids: match ids to include (all matches when None)
+        phases: match phases for the per-phase columns; DEFAULT_PHASES (PP_*, MID_*, DO_*) when None
+    Returns:
+        DataFrame indexed by player with career columns and BOWLING_PHASE_STATS for every phase
+    """
+    phases = DEFAULT_PHASES if phases is None else phases
+    deliveries = store['deliveries']
+    wickets = store['wickets']
+    # Wickets take the super-over flag of the delivery they fell on
+    keep_wickets = ~deliveries['super_over'].to_numpy()[wickets['delivery'].to_numpy()]
+    keep_deliveries = ~deliveries['super_over'].to_numpy()
+    if match_ids is not None:
+        match_ids = list(match_ids)
+        keep_wickets &= wickets['match_id'].isin(match_ids).to_numpy()
+        keep_deliveries &= deliveries['match_id'].isin(match_ids).to_numpy()
+    wickets = wickets[keep_wickets]
+    deliveries = deliveries[keep_deliveries]
+
+    # Each (bowler, slot) pair is one bin; slots are the phases plus one for overs outside every phase
+    n_players = len(store['players'])
+    n_slots = len(phases) + 1
+    n_bins = n_players * n_slots
+
+    def _bins(codes, overs):
+        slot = _phase_index(overs, phases)
+        slot = np.where(slot < 0, len(phases), slot)
+        keep = codes >= 0
+        return codes[keep] * n_slots + slot[keep], keep
+
+    bowler = deliveries['bowler_id'].to_numpy().astype(np.int64)
+    bat_runs = deliveries['batter_runs'].to_numpy().astype(np.int64)
+    wides = deliveries['wides'].to_numpy().astype(np.int64)
+    noballs = deliveries['noballs'].to_numpy().astype(np.int64)
+    legal = (wides == 0) & (noballs == 0)
+    runs = bat_runs + wides + noballs
+    bins, keep = _bins(bowler, deliveries['over'].to_numpy())
+    counts = {
+        'deliveries': np.bincount(bins, minlength=n_bins),
+        'balls': np.bincount(bins, weights=legal[keep], minlength=n_bins),
+        'runs': np.bincount(bins, weights=runs[keep], minlength=n_bins),
+        'dots': np.bincount(bins, weights=(legal & (runs == 0))[keep], minlength=n_bins),
+        'fours': np.bincount(bins, weights=(bat_runs == 4)[keep], minlength=n_bins),
+        'sixes': np.bincount(bins, weights=(bat_runs == 6)[keep], minlength=n_bins),
+        'wides': np.bincount(bins, weights=(wides > 0)[keep], minlength=n_bins),
+        'noballs': np.bincount(bins, weights=(noballs > 0)[keep], minlength=n_bins),
+    }
+    credited = wickets['kind'].isin(BOWLER_WICKET_KINDS).to_numpy()
+    wicket_bowler = wickets['bowler_id'].to_numpy().astype(np.int64)
+    bins, _ = _bins(wicket_bowler[credited], wickets['over'].to_numpy()[credited])
+    counts['wickets'] = np.bincount(bins, minlength=n_bins)
+    counts = {name: c.astype(np.int64).reshape(n_players, n_slots) for name, c in counts.items()}
+    career = {name: c.sum(axis=1) for name, c in counts.items()}
+
+    # Matches and innings bowled in: distinct (match, bowler) and (match, innings, bowler) keys
+    # over the deliveries with a named bowler (id -1 would wrap onto the last player)
+    named = bowler >= 0
+    match_code = deliveries['match_id'].cat.codes.to_numpy().astype(np.int64)[named]
+    innings = deliveries['innings'].to_numpy().astype(np.int64)[named]
+    n_bowlers = max(n_players, 1)
+    match_keys = np.unique(match_code * n_bowlers + bowler[named])
+    innings_keys = np.unique((match_code * (innings.max(initial=0) + 1) + innings) * n_bowlers + bowler[named])
+    career['matches'] = np.bincount(match_keys % n_bowlers, minlength=n_players)
+    career['innings'] = np.bincount(innings_keys % n_bowlers, minlength=n_players)
+
+    rows = np.flatnonzero(career['deliveries'] > 0)
+    players = pd.Index(player_names(store, rows), name='Player')
+
+    def _bowling_block(balls, runs, wickets_, dots, fours, sixes, prefix):
+        return {
+            f'{prefix}Overs': _overs(balls),
+            f'{prefix}Balls': balls,
+            f'{prefix}Runs': runs,
+            f'{prefix}Wickets': wickets_,
+            f'{prefix}Economy': _ratio(runs, balls, 6),
+            f'{prefix}Average': _ratio(runs, wickets_),
+            f'{prefix}SR': _ratio(balls, wickets_),
+            f'{prefix}Dots': dots,
+            f'{prefix}Dot_%': _ratio(dots, balls, 100, 0.0),
+            f'{prefix}4s': fours,
+            f'{prefix}6s': sixes,
+        }
+
+    out = {'Matches': career['matches'][rows], 'Innings': career['innings'][rows]}
+    out.update(_bowling_block(*(career[c][rows] for c in ['balls', 'runs', 'wickets', 'dots', 'fours', 'sixes']),
+                              prefix=''))
+    out['Wides'] = career['wides'][rows]
+    out['No Balls'] = career['noballs'][rows]
+    for i, (prefix, _, _) in enumerate(phases):
+        out.update(_bowling_block(*(counts[c][rows, i] for c in ['balls', 'runs', 'wickets', 'dots', 'fours', 'sixes']),
+                                  prefix=f'{prefix}_'))
+
+    out = pd.DataFrame(out, index=players).sort_index()
+    out.index.name = 'Player'
+    return out
@@ -0,0 +1,98 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Page sizes offered by the paginated tables
+PAGE_SIZES = (25, 50, 100, 250)
+# Display names of the column groups of known match phases; other phases are shown by prefix
+PHASE_LABELS = {"PP": "Powerplay", "MID": "Middle overs", "DO": "Death overs"}
+
+
+def batting_column_groups(columns, phases, positions=None):
+    """
+    Split Batting Stats column (or stat-row) names into the groups a table can show.
+    Args:
+        columns: names in display order
+        phases: match phases as (column prefix, first over, last over)
+        positions: batting positions whose {p}_* names are kept (all positions when None)
+    Returns:
+        dict of group label -> names in the given order: 'Career', 'Selected positions', one group
+        per phase and 'Per position'; empty groups are left out
+    """
+    phase_groups = {prefix: PHASE_LABELS.get(prefix, prefix) for prefix, _, _ in phases}
+    groups = {"Career": [], "Selected positions": [], **{label: [] for label in phase_groups.values()},
+              "Per position": []}
+    for c in columns:
+        head, _, rest = c.partition("_")
+        if rest and head.isdigit():
+            if positions is None or int(head) in positions:
+                groups["Per position"].append(c)
+        elif rest and head == "SelPos":
+            groups["Selected positions"].append(c)
+        elif rest and head in phase_groups:
+            groups[phase_groups[head]].append(c)
+        else:
+            groups["Career"].append(c)
+    return {label: names for label, names in groups.items() if names}
+
+
+def page_frame(df, page=1, page_size=PAGE_SIZES[0], sort_by=None, ascending=False, columns=None):
+    """
+    One page of a table sorted on one column. Only the sort column is ordered over all rows;
+    the page's rows and the requested columns are then taken in a single step.
+    Args:
+        df: full table
+        page: 1-based page number, clamped to the available pages
+        page_size: rows per page
+        sort_by: column to sort on (df's own row order when None); NaN sorts last in both directions
+        ascending: sort direction
+        columns: columns to return (all when None)
+    Returns:
+        (page DataFrame, clamped page number, number of pages)
+    """
+    n_pages = max(math.ceil(len(df) / page_size), 1)
+    page = min(max(int(page), 1), n_pages)
+    start = (page - 1) * page_size
+    if sort_by is None:
+        rows = np.arange(start, min(start + page_size, len(df)))
+    else:
+        order = (df[sort_by].reset_index(drop=True)
+                 .sort_values(ascending=ascending, na_position="last", kind="stable").index)
+        rows = order[start:start + page_size].to_numpy()
+    col_idx = np.arange(df.shape[1]) if columns is None else df.columns.get_indexer(list(columns))
+    return df.iloc[rows, col_idx], page, n_pages
+
+
+def _stat_format(name, dtype, precision):
+    """Format string of one numeric stats column: integers as-is, ratios rounded, '%' stats with a percent sign."""
+    if pd.api.types.is_integer_dtype(dtype):
+        return "{:d}"
+    return f"{{:.{precision}f}}" + ("%" if name.endswith("%") else "")
+
+
+def style_stats(df, precision=2, na_rep="-"):
+    """
+    Display formatting of a numeric stats table, applied at render time only.
+    The values stay numeric (so the grid still sorts them as numbers); undefined (NaN) ratios show as na_rep.
+    Returns: pandas Styler for st.dataframe
+    """
+    formats = {c: _stat_format(str(c), df[c].dtype, precision)
+               for c in df.columns if pd.api.types.is_numeric_dtype(df[c].dtype)}
+    return df.style.format(formats, na_rep=na_rep)
+
+
+def format_stats(df, precision=2, na_rep="-"):
+    """
+    Display strings of a numeric stats table (for views such as a transpose that mix stats in one column).
+    Returns: DataFrame of strings with df's index and columns
+    """
+    out = {}
+    for c in df.columns:
+        values = df[c]
+        if not pd.api.types.is_numeric_dtype(values.dtype):
+            out[c] = values.astype(str)
+            continue
+        fmt = _stat_format(str(c), values.dtype, precision)
+        out[c] = [na_rep if pd.isna(v) else fmt.format(v) for v in values]
+    return pd.DataFrame(out, index=df.index)
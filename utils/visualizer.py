@@ -1,4 +1,42 @@
 import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+# Scatter plots with more points than this are drawn with WebGL (scattergl) instead of SVG
+WEBGL_POINT_THRESHOLD = 500
+
+# Axis styling shared by every chart
+AXIS_STYLE = dict(title_font=dict(size=16), tickfont=dict(size=12), showgrid=True, gridcolor='lightgray', gridwidth=0.5, showline=True, linecolor='black', linewidth=1, minor=dict(showgrid=False, gridcolor='rgba(200,200,200,0.2)'))
+
+# Layout template registered once and layered on top of plotly's default template
+pio.templates['cric_stats'] = go.layout.Template(layout=dict(
+    title_font=dict(size=20),
+    title_x=0.5,
+    xaxis=AXIS_STYLE,
+    yaxis=AXIS_STYLE,
+    legend=dict(font=dict(size=12))
+))
+CHART_TEMPLATE = 'plotly+cric_stats'
+
+
+def use_webgl(n_points, threshold=None):
+    """True when a scatter of n_points should be drawn with WebGL."""
+    return n_points > (WEBGL_POINT_THRESHOLD if threshold is None else threshold)
+
+
+def _render_mode(n_points, threshold=None):
+    return 'webgl' if use_webgl(n_points, threshold) else 'svg'
+
+
+def add_point_labels(fig, x, y, labels, size=8, threshold=None):
+    """Label many points with one text-only trace (instead of one annotation per point)."""
+    trace = go.Scattergl if use_webgl(len(labels), threshold) else go.Scatter
+    fig.add_trace(trace(
+        x=x, y=y, text=labels,
+        mode='text', textposition='top center', textfont=dict(size=size),
+        hoverinfo='skip', showlegend=False
+    ))
+    return fig
 
 
 def plot_runs_per_match(df):
@@ -11,17 +49,11 @@ def plot_runs_per_match(df):
                     color='team',
                     title="Batting Performance",
                     labels={'player': 'Batsman', 'runs': 'Runs Scored'},
-                    hover_data=['balls', 'fours', 'sixes', 'strike_rate'])
-        fig.update_layout(
-            xaxis_tickangle=-45,
-            title_font=dict(size=20),
-            title_x=0.5,
-            xaxis=dict(title_font=dict(size=16), tickfont=dict(size=12), showgrid=True, gridcolor='lightgray', gridwidth=0.5, showline=True, linecolor='black', linewidth=1, minor=dict(showgrid=False, gridcolor='rgba(200,200,200,0.2)')),
-            yaxis=dict(title_font=dict(size=16), tickfont=dict(size=12), showgrid=True, gridcolor='lightgray', gridwidth=0.5, showline=True, linecolor='black', linewidth=1, minor=dict(showgrid=False, gridcolor='rgba(200,200,200,0.2)')),
-            legend=dict(font=dict(size=12))
-        )
+                    hover_data=['balls', 'fours', 'sixes', 'strike_rate'],
+                    template=CHART_TEMPLATE)
+        fig.update_layout(xaxis_tickangle=-45)
         return fig
-    return px.scatter(title="No batting data found")
+    return px.scatter(title="No batting data found", template=CHART_TEMPLATE)
 
 def plot_top_players(df):
     """Plot bowling performance."""
@@ -33,31 +65,27 @@ def plot_top_players(df):
                     color='team',
                     title="Bowling Performance",
                     labels={'player': 'Bowler', 'wickets': 'Wickets Taken'},
-                    hover_data=['overs', 'runs', 'economy'])
-        fig.update_layout(
-            xaxis_tickangle=-45,
-            title_font=dict(size=20),
-            title_x=0.5,
-            xaxis=dict(title_font=dict(size=16), tickfont=dict(size=12), showgrid=True, gridcolor='lightgray', gridwidth=0.5, showline=True, linecolor='black', linewidth=1, minor=dict(showgrid=False, gridcolor='rgba(200,200,200,0.2)')),
-            yaxis=dict(title_font=dict(size=16), tickfont=dict(size=12), showgrid=True, gridcolor='lightgray', gridwidth=0.5, showline=True, linecolor='black', linewidth=1, minor=dict(showgrid=False, gridcolor='rgba(200,200,200,0.2)')),
-            legend=dict(font=dict(size=12))
-        )
+                    hover_data=['overs', 'runs', 'economy'],
+                    template=CHART_TEMPLATE)
+        fig.update_layout(xaxis_tickangle=-45)
         return fig
-    return px.scatter(title="No bowling data found")
+    return px.scatter(title="No bowling data found", template=CHART_TEMPLATE)
 
 
-def plot_true_batting_stats(df):
+def plot_true_batting_stats(df, webgl_threshold=None):
     """Create scatter plot of true average vs true strike rate."""
     fig = px.scatter(
-        df, 
-        x='true_sr', 
+        df,
+        x='true_sr',
         y='true_avg',
         hover_data=['batter', 'runs', 'matches_played'],
         title='True Average vs True Strike Rate (Top Run Scorers)',
         labels={
             'true_sr': 'True Strike Rate (%)',
             'true_avg': 'True Average (%)'
-        }
+        },
+        render_mode=_render_mode(len(df), webgl_threshold),
+        template=CHART_TEMPLATE
     )
 
     # Add quadrant lines
@@ -70,25 +98,17 @@ def plot_true_batting_stats(df):
     fig.add_annotation(x=20, y=-20, text="Low Avg, High SR", showarrow=False, font=dict(color="orange"))
     fig.add_annotation(x=-20, y=-20, text="Low Avg & SR", showarrow=False, font=dict(color="red"))
 
-    fig.update_layout(
-        width=800,
-        height=600,
-    showlegend=False,
-    title_font=dict(size=20),
-    title_x=0.5,
-    xaxis=dict(title_font=dict(size=16), tickfont=dict(size=12), showgrid=True, gridcolor='lightgray', gridwidth=0.5, showline=True, linecolor='black', linewidth=1, minor=dict(showgrid=False, gridcolor='rgba(200,200,200,0.2)')),
-    yaxis=dict(title_font=dict(size=16), tickfont=dict(size=12), showgrid=True, gridcolor='lightgray', gridwidth=0.5, showline=True, linecolor='black', linewidth=1, minor=dict(showgrid=False, gridcolor='rgba(200,200,200,0.2)'))
-    )
+    fig.update_layout(width=800, height=600, showlegend=False)
 
     return fig
 
 
-def plot_match_level_true_batting_stats(df):
+def plot_match_level_true_batting_stats(df, webgl_threshold=None):
     """Create scatter plot for match-level true batting stats."""
     # Color by team
     fig = px.scatter(
-        df, 
-        x='true_strike_rate', 
+        df,
+        x='true_strike_rate',
         y='true_average',
         color='team',
         size='runs',
@@ -97,7 +117,9 @@ def plot_match_level_true_batting_stats(df):
         labels={
             'true_strike_rate': 'True Strike Rate (%)',
             'true_average': 'True Average (%)'
-        }
+        },
+        render_mode=_render_mode(len(df), webgl_threshold),
+        template=CHART_TEMPLATE
     )
 
     # Add quadrant lines
@@ -110,25 +132,99 @@ def plot_match_level_true_batting_stats(df):
     fig.add_annotation(x=10, y=-10, text="Aggressive", showarrow=False, font=dict(color="orange"))
     fig.add_annotation(x=-10, y=-10, text="Below Average", showarrow=False, font=dict(color="red"))
 
-    # Add player names as text
-    for _, row in df.iterrows():
-        fig.add_annotation(
-            x=row['true_strike_rate'],
-            y=row['true_average'],
-            text=row['player'].split()[-1],  # Last name only
-            showarrow=False,
-            font=dict(size=8),
-            yshift=10
-        )
+    # Add player names (last name only) as one text trace
+    if not df.empty:
+        add_point_labels(fig, df['true_strike_rate'], df['true_average'],
+                         df['player'].str.split().str[-1], threshold=webgl_threshold)
 
+    fig.update_layout(width=800, height=600)
+
+    return fig
+
+
+def plot_player_comparison(df, x_col, y_col, x_label, y_label, hover_cols=(), webgl_threshold=None):
+    """
+    Bubble plot of two Batting Stats columns with one labelled point per player (players are the index).
+    All points are one marker trace plus one text trace, drawn with WebGL above the point threshold.
+    """
+    if df.empty:
+        return px.scatter(title="No players to plot", template=CHART_TEMPLATE)
+    players = df.index.astype(str)
+    hover_cols = [c for c in hover_cols if c in df.columns]
+    # Every player keeps a distinct colour from the qualitative palette, as with one trace per player
+    palette = px.colors.qualitative.Plotly
+    colors = [palette[i % len(palette)] for i in range(len(df))]
+    trace = go.Scattergl if use_webgl(len(df), webgl_threshold) else go.Scatter
+    fig = go.Figure(trace(
+        x=df[x_col], y=df[y_col],
+        mode='markers',
+        marker=dict(size=14, color=colors),
+        customdata=df[hover_cols].to_numpy() if hover_cols else None,
+        hovertext=players,
+        # Values are unrounded; hover shows at most two decimals
+        hovertemplate='<b>%{hovertext}</b><br>' + f'{x_label}=%{{x:.2~f}}<br>{y_label}=%{{y:.2~f}}'
+                      + ''.join(f'<br>{c}=%{{customdata[{i}]:.2~f}}' for i, c in enumerate(hover_cols)) + '<extra></extra>',
+        showlegend=False
+    ))
+    add_point_labels(fig, df[x_col], df[y_col], players, size=12, threshold=webgl_threshold)
     fig.update_layout(
-        width=800,
+        template=CHART_TEMPLATE,
+        title=f"{y_label} vs {x_label}",
         height=600,
-        title_font=dict(size=20),
-        title_x=0.5,
-    xaxis=dict(title_font=dict(size=16), tickfont=dict(size=12), showgrid=True, gridcolor='lightgray', gridwidth=0.5, showline=True, linecolor='black', linewidth=1, minor=dict(showgrid=False, gridcolor='rgba(200,200,200,0.2)')),
-    yaxis=dict(title_font=dict(size=16), tickfont=dict(size=12), showgrid=True, gridcolor='lightgray', gridwidth=0.5, showline=True, linecolor='black', linewidth=1, minor=dict(showgrid=False, gridcolor='rgba(200,200,200,0.2)')),
-    legend=dict(font=dict(size=12))
+        title_font=dict(size=18),
+        xaxis=dict(title=x_label, title_font=dict(size=20), tickfont=dict(size=18)),
+        yaxis=dict(title=y_label, title_font=dict(size=20), tickfont=dict(size=18))
+    )
+    return fig
+
+
+def plot_true_batting_form(df, metric='true_average', window=10, webgl_threshold=None):
+    """Line chart of rolling true average or true strike rate per match, one line per batter."""
+    if df.empty or metric not in df:
+        return px.scatter(title="No batting form data found", template=CHART_TEMPLATE)
+    label = 'True Average (%)' if metric == 'true_average' else 'True Strike Rate (%)'
+    fig = px.line(
+        df,
+        x='date',
+        y=metric,
+        color='batter',
+        markers=True,
+        hover_data=['match_no', 'window_matches', 'window_runs', 'window_balls', 'window_outs'],
+        title=f'{label} over the last {window} matches' if window else f'Career {label}',
+        labels={'date': 'Match Date', metric: label, 'batter': 'Batter'},
+        render_mode=_render_mode(len(df), webgl_threshold),
+        template=CHART_TEMPLATE
     )
 
-    return fig
\ No newline at end of file
+    # Zero is the team top-6 baseline
+    fig.add_hline(y=0, line_dash="dash", line_color="gray", opacity=0.5)
+
+    fig.update_layout(height=500)
+
+    return fig
+
+
+def plot_bowling_stats(df, webgl_threshold=None):
+    """Create scatter plot of economy vs strike rate, sized by wickets."""
+    if df.empty or 'Economy' not in df or 'SR' not in df:
+        return px.scatter(title="No bowling data found", template=CHART_TEMPLATE)
+    fig = px.scatter(
+        df,
+        x='Economy',
+        y='SR',
+        size='Wickets',
+        hover_name=df.index,
+        hover_data=['Overs', 'Runs', 'Wickets', 'Average', 'Dot_%'],
+        title='Economy vs Strike Rate',
+        labels={'Economy': 'Economy (runs per over)', 'SR': 'Strike Rate (balls per wicket)'},
+        render_mode=_render_mode(len(df), webgl_threshold),
+        template=CHART_TEMPLATE
+    )
+
+    # Lower is better on both axes
+    fig.update_yaxes(autorange="reversed")
+    fig.update_xaxes(autorange="reversed")
+
+    fig.update_layout(height=600)
+
+    return fig